@@ -40,7 +40,17 @@ Features:
     - Support for multiple agent frameworks
 """
 
-from .monitor import AgentMonitor, get_global_monitor, set_global_monitor
+from typing import Optional
+
+from .monitor import (
+    AgentMonitor,
+    get_global_monitor,
+    set_global_monitor,
+    set_enabled,
+    VERBOSE,
+    STANDARD,
+    CRITICAL
+)
 from .client import AgentClient
 from .exceptions import (
     AgentMonitorError,
@@ -64,6 +74,9 @@ __email__ = "support@minimax.com"
 __all__ = [
     "AgentMonitor",
     "AgentClient", 
+    "VERBOSE",
+    "STANDARD",
+    "CRITICAL",
     "AgentMonitorError",
     "ConnectionError",
     "AuthenticationError",
@@ -73,7 +86,8 @@ __all__ = [
     "LangGraphIntegration", 
     "CustomIntegration",
     "init",
-    "quick_start"
+    "quick_start",
+    "set_enabled"
 ]
 
 # Global initialization function
@@ -82,7 +96,8 @@ def init(
     dashboard_url: str,
     timeout: int = 30,
     retry_count: int = 3,
-    enable_logging: bool = False
+    enable_logging: bool = False,
+    enabled: Optional[bool] = None
 ):
     """
     Initialize the agent monitoring system globally.
@@ -96,6 +111,11 @@ def init(
         timeout: Request timeout in seconds (default: 30)
         retry_count: Number of retry attempts (default: 3)
         enable_logging: Enable debug logging (default: False)
+        enabled: Send logs, metrics and status updates; when False every
+            logging call returns immediately. Registration and heartbeats
+            are still sent. The default, None, keeps the current setting, so an
+            earlier set_enabled(False) isn't undone. Can be changed later with
+            set_enabled()
         
     Example:
         import agent_monitor
@@ -107,6 +127,9 @@ def init(
         
         # Your agent code runs here - monitoring happens automatically
     """
+    if enabled is not None:
+        set_enabled(enabled)
+    
     # Initialize global configuration
     config_init(
         api_key=api_key,
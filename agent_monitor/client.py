@@ -5,15 +5,87 @@ Handles all communication with the Supabase backend including agent registration
 status updates, log submission, and heartbeat management.
 """
 
-import json
 import time
 import uuid
+import weakref
 import threading
+from collections import deque
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 
+import orjson
 import requests
-from .exceptions import ConnectionError, AuthenticationError, AgentMonitorError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .config import get_config
+from .exceptions import ConnectionError, AuthenticationError, AgentMonitorError, ConfigurationError
+
+# zstd request compression is optional
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Log batches larger than this many bytes are compressed when compression is on
+COMPRESSION_THRESHOLD = 512
+
+
+def _build_session() -> requests.Session:
+    """
+    Create the pooled session shared by every client in the process.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=50,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# numpy values in metrics and naive datetimes (taken as UTC) serialize directly
+_JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _dumps(payload: Any) -> bytes:
+    """
+    Encode a request body as JSON bytes.
+    """
+    return orjson.dumps(payload, option=_JSON_OPTIONS)
+
+
+def _dumps_rows(rows: List[Dict[str, Any]], on_error) -> bytes:
+    """
+    Encode rows as a JSON array one row at a time, so that a row that can't be
+    encoded doesn't take the rest of the batch with it. Values orjson can't
+    serialize are stringified; rows that still fail are passed to on_error
+    and left out.
+    """
+    parts = []
+    for row in rows:
+        try:
+            parts.append(_dumps(row))
+        except orjson.JSONEncodeError:
+            try:
+                parts.append(orjson.dumps(row, default=str, option=_JSON_OPTIONS))
+            except orjson.JSONEncodeError as e:
+                on_error(f"Dropped log entry that can't be encoded: {e}")
+    return b"[" + b",".join(parts) + b"]" if parts else b""
+
+
+def _iso_from_ns(timestamp_ns: int) -> str:
+    """
+    Format an epoch timestamp in nanoseconds as an ISO 8601 UTC string.
+    """
+    seconds, nanos = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(microsecond=nanos // 1000).isoformat()
+
+
+# All clients talk to the same few hosts, so they share one connection pool
+# and keep-alive connections instead of handshaking per client
+_SESSION = _build_session()
 
 
 class AgentClient:
@@ -24,7 +96,7 @@ class AgentClient:
     including agent registration, status updates, and log submission.
     """
     
-    def __init__(self, dashboard_url: str, api_key: str, timeout: int = 30):
+    def __init__(self, dashboard_url: str, api_key: str, timeout: int = 30, compress: bool = False):
         """
         Initialize the agent client.
         
@@ -32,7 +104,13 @@ class AgentClient:
             dashboard_url: Base URL of the dashboard
             api_key: Supabase API key for authentication
             timeout: Request timeout in seconds
+            compress: Send large log batches zstd-compressed (requires zstandard)
         """
+        if compress and zstandard is None:
+            raise ConfigurationError(
+                "Compression requires the zstandard package: pip install agent-monitor[compression]"
+            )
+        
         self.dashboard_url = dashboard_url.rstrip('/')
         self.api_key = api_key
         self.timeout = timeout
@@ -41,29 +119,47 @@ class AgentClient:
         if 'minimax.io' in dashboard_url:
             # For deployed dashboards, use the known Supabase URL  
             self.supabase_url = "https://ybhjabiromsmnqrzmnab.supabase.co"
-            # Use the provided API key for authentication
-            # This should be a service role key for agent monitoring
-            self.headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {api_key}',
-                'apikey': api_key
-            }
         else:
             # For custom deployments, try to extract from URL
             self.supabase_url = dashboard_url.replace('/dashboard', '')
-            self.headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {api_key}',
-                'apikey': api_key
-            }
         
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        # Use the provided API key for authentication
+        # This should be a service role key for agent monitoring.
+        # Built once and reused by every request.
+        self.headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {api_key}',
+            'apikey': api_key,
+            'User-Agent': 'agent-monitor/1.0'
+        }
+        
+        # Headers are passed per request since the session is shared
+        self.session = _SESSION
+        
+        # Endpoint URLs and request templates are built once; each call only
+        # copies a template and attaches its body
+        self.agents_url = f"{self.supabase_url}/rest/v1/agents"
+        self.logs_url = f"{self.supabase_url}/rest/v1/agent_logs"
+        self._send_settings = self.session.merge_environment_settings(
+            self.supabase_url, {}, None, None, None
+        )
+        self._logs_request = self._prepare('POST', self.logs_url)
+        self._status_request = None
+        
+        # Only the batch thread sends compressed bodies, so one compressor suffices
+        self._compressor = zstandard.ZstdCompressor(level=3) if compress else None
+        if self._compressor:
+            self._logs_zstd_request = self._prepare(
+                'POST', self.logs_url, {**self.headers, 'Content-Encoding': 'zstd'}
+            )
         
         # Agent info
         self.agent_id = None
         self.user_id = None
         
+        # Failed log and status requests; only reported when debug logging is on
+        self.send_errors = 0
+        
     def register_agent(self, agent_name: str, group_id: str, metadata: Optional[Dict] = None) -> str:
         """
         Register a new agent with the dashboard.
@@ -85,6 +181,10 @@ class AgentClient:
             # Generate unique agent ID
             self.agent_id = f"{agent_name.lower().replace(' ', '_')}_{int(time.time())}_{str(uuid.uuid4())[:8]}"
         
+        if self._status_request is None:
+            self._status_request = self._prepare('PATCH', f"{self.agents_url}?agent_id=eq.{self.agent_id}")
+        
+        now = datetime.now(timezone.utc).isoformat()
         agent_data = {
             'agent_id': self.agent_id,
             'name': agent_name,
@@ -92,8 +192,8 @@ class AgentClient:
             'status': 'running',
             'connection_status': 'connected',
             'is_active': True,
-            'last_seen': datetime.now(timezone.utc).isoformat(),
-            'last_heartbeat': datetime.now(timezone.utc).isoformat(),
+            'last_seen': now,
+            'last_heartbeat': now,
             'metadata': metadata or {},
             'position_x': 100,  # Default position
             'position_y': 100
@@ -101,8 +201,9 @@ class AgentClient:
         
         try:
             response = self.session.post(
-                f"{self.supabase_url}/rest/v1/agents",
-                json=agent_data,
+                self.agents_url,
+                data=_dumps(agent_data),
+                headers=self.headers,
                 timeout=self.timeout
             )
             
@@ -143,18 +244,70 @@ class AgentClient:
         }
         
         try:
-            response = self.session.post(
-                f"{self.supabase_url}/rest/v1/agent_logs",
-                json=log_data,
-                timeout=self.timeout
-            )
+            response = self._send(self._logs_request, _dumps(log_data))
             
             if not response.ok:
-                # Log failures shouldn't break the agent, just warn
-                print(f"Warning: Failed to send log to dashboard: {response.status_code}")
+                # Log failures shouldn't break the agent
+                self._send_failed(f"Failed to send log to dashboard: {response.status_code}")
                 
         except requests.exceptions.RequestException as e:
-            print(f"Warning: Failed to connect to dashboard for logging: {str(e)}")
+            self._send_failed(f"Failed to connect to dashboard for logging: {str(e)}")
+    
+    def send_logs(self, entries: List[Dict[str, Any]]):
+        """
+        Send several log messages to the dashboard in a single request.
+        
+        Args:
+            entries: Log entries, each with 'message_type' and 'message' keys
+                and optional 'metadata' and 'timestamp' keys. The timestamp may
+                also be given as epoch nanoseconds under 'timestamp_ns', which
+                is formatted here rather than by the caller
+            
+        Raises:
+            AgentMonitorError: If log submission fails
+        """
+        if not self.agent_id:
+            raise AgentMonitorError("Agent must be registered before sending logs")
+        
+        if not entries:
+            return
+        
+        timestamp = datetime.now(timezone.utc).isoformat()
+        log_data = [
+            {
+                'agent_id': self.agent_id,
+                'message_type': entry['message_type'],
+                'message': entry['message'],
+                'metadata': entry.get('metadata') or {},
+                'timestamp': entry.get('timestamp') or (
+                    _iso_from_ns(entry['timestamp_ns']) if 'timestamp_ns' in entry else timestamp
+                )
+            }
+            for entry in entries
+        ]
+        
+        try:
+            # The REST endpoint inserts every row of a JSON array in one call
+            try:
+                body = _dumps(log_data)
+            except orjson.JSONEncodeError:
+                body = _dumps_rows(log_data, self._send_failed)
+                if not body:
+                    return
+            if self._compressor and len(body) > COMPRESSION_THRESHOLD:
+                response = self._send(self._logs_zstd_request, self._compressor.compress(body))
+                if response.status_code == 415:
+                    # The server can't decode zstd bodies: stop compressing
+                    self._compressor = None
+                    response = self._send(self._logs_request, body)
+            else:
+                response = self._send(self._logs_request, body)
+            
+            if not response.ok:
+                self._send_failed(f"Failed to send logs to dashboard: {response.status_code}")
+                
+        except requests.exceptions.RequestException as e:
+            self._send_failed(f"Failed to connect to dashboard for logging: {str(e)}")
     
     def update_status(self, status: str, metadata: Optional[Dict] = None):
         """
@@ -173,31 +326,51 @@ class AgentClient:
         if not self.agent_id:
             raise AgentMonitorError("Agent must be registered before updating status")
         
+        now = datetime.now(timezone.utc).isoformat()
         update_data = {
             'status': status,
-            'last_seen': datetime.now(timezone.utc).isoformat(),
-            'last_heartbeat': datetime.now(timezone.utc).isoformat(),
-            'updated_at': datetime.now(timezone.utc).isoformat()
+            'last_seen': now,
+            'last_heartbeat': now,
+            'updated_at': now
         }
         
         if metadata:
             update_data['metadata'] = metadata
         
         try:
-            response = self.session.patch(
-                f"{self.supabase_url}/rest/v1/agents?agent_id=eq.{self.agent_id}",
-                json=update_data,
-                timeout=self.timeout
-            )
+            response = self._send(self._status_request, _dumps(update_data))
             
             if not response.ok:
-                print(f"Warning: Failed to update agent status: {response.status_code}")
+                self._send_failed(f"Failed to update agent status: {response.status_code}")
                 
         except requests.exceptions.RequestException as e:
-            print(f"Warning: Failed to connect to dashboard for status update: {str(e)}")
+            self._send_failed(f"Failed to connect to dashboard for status update: {str(e)}")
         
         return self.agent_id
     
+    def _prepare(self, method: str, url: str, headers: Optional[Dict[str, str]] = None) -> requests.PreparedRequest:
+        """
+        Build a bodiless request template with the session and auth headers applied.
+        """
+        return self.session.prepare_request(requests.Request(method, url, headers=headers or self.headers))
+    
+    def _send(self, template: requests.PreparedRequest, body: bytes) -> requests.Response:
+        """
+        Send an encoded body using a copy of a prebuilt request template.
+        """
+        # Templates are shared between threads, so the body goes on a copy
+        request = template.copy()
+        request.prepare_body(data=body, files=None)
+        return self.session.send(request, timeout=self.timeout, **self._send_settings)
+    
+    def _send_failed(self, message: str):
+        """
+        Count a failed request, printing it only when debug logging is enabled.
+        """
+        self.send_errors += 1
+        if get_config().enable_logging:
+            print(f"Warning: {message}")
+    
     def send_heartbeat(self):
         """
         Send a heartbeat to indicate the agent is still alive.
@@ -210,8 +383,6 @@ class AgentClient:
         """
         if self.agent_id:
             self._update_agent_status('offline')
-        if self.session:
-            self.session.close()
 
 
 class HeartbeatThread(threading.Thread):
@@ -237,3 +408,183 @@ class HeartbeatThread(threading.Thread):
     
     def stop(self):
         self.running = False
+
+
+class LogBatcher(threading.Thread):
+    """
+    Background thread that buffers log entries and sends them in batches.
+    
+    Each logging thread appends to its own bounded ring buffer, so logging
+    takes no shared lock and never waits on the network. The batch thread
+    collects every buffer and sends once max_batch entries are pending,
+    flush_interval seconds after the first pending entry, on flush() and on
+    stop(). Status updates are coalesced so only the latest is sent. When a
+    thread's buffer holds max_queue entries its oldest entries are dropped.
+    """
+    
+    def __init__(self, client: AgentClient, flush_interval: float = 5.0,
+                 max_batch: int = 100, max_queue: int = 10000):
+        super().__init__(daemon=True)
+        self.client = client
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.running = False
+        
+        # Per-thread buffers, plus a registry of (thread, buffer) pairs for
+        # the batch thread. The registry lock is taken once per new thread.
+        self._local = threading.local()
+        self._buffers: List[tuple] = []
+        self._registry_lock = threading.Lock()
+        
+        self._status = None
+        self._status_lock = threading.Lock()
+        
+        # flush() waits until the batch thread has sent up to its request
+        self._wake = threading.Event()
+        self._flush_cond = threading.Condition()
+        self._flush_requested = 0
+        self._flushed = 0
+    
+    def add(self, entries: List[Dict[str, Any]]):
+        """
+        Queue log entries for the next batch.
+        
+        Args:
+            entries: Log entries in the format accepted by AgentClient.send_logs
+        """
+        # Only take the raw clock here; formatting happens on the sender thread
+        timestamp_ns = time.time_ns()
+        for entry in entries:
+            entry.setdefault('timestamp_ns', timestamp_ns)
+        
+        # A full ring drops its oldest entries as new ones are appended
+        buf = self._buffer()
+        buf.extend(entries)
+        if len(buf) >= self.max_batch:
+            self._wake.set()  # Ring the doorbell only when a batch is ready
+    
+    def set_status(self, status: str, metadata: Optional[Dict] = None):
+        """
+        Queue a status update, replacing any update not yet sent.
+        """
+        with self._status_lock:
+            self._status = (status, metadata)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until everything queued so far has been sent.
+        
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            bool: True if everything was sent within the timeout
+        """
+        if not self.is_alive():
+            self._drain()
+            return True
+        
+        with self._flush_cond:
+            self._flush_requested += 1
+            target = self._flush_requested
+        self._wake.set()
+        
+        with self._flush_cond:
+            return self._flush_cond.wait_for(lambda: self._flushed >= target, timeout)
+    
+    def run(self):
+        self.running = True
+        deadline = None
+        while True:
+            timeout = 0.2 if deadline is None else min(0.2, max(0.0, deadline - time.monotonic()))
+            self._wake.wait(timeout)
+            self._wake.clear()
+            
+            with self._flush_cond:
+                requested = self._flush_requested
+            pending = self._pending()
+            if pending and deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            
+            if (requested > self._flushed or not self.running or pending >= self.max_batch
+                    or (deadline is not None and time.monotonic() >= deadline)):
+                self._drain()
+                deadline = None
+                with self._flush_cond:
+                    self._flushed = requested
+                    self._flush_cond.notify_all()
+            
+            if not self.running:
+                break
+        
+        # Entries added while the last drain was sending (say, while stop()
+        # gave up waiting on a slow request) still go out
+        self._drain()
+    
+    def stop(self):
+        """
+        Stop the thread and send whatever is still buffered.
+        """
+        self.running = False
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout=self.client.timeout)
+        # A thread still stuck in a send drains the rest itself once it returns
+        if not self.is_alive():
+            self._drain()
+    
+    def _buffer(self) -> deque:
+        """
+        The calling thread's buffer, registering it on first use.
+        """
+        try:
+            return self._local.buf
+        except AttributeError:
+            buf = self._local.buf = deque(maxlen=self.max_queue)
+            with self._registry_lock:
+                self._buffers.append((weakref.ref(threading.current_thread()), buf))
+            return buf
+    
+    def _pending(self) -> int:
+        count = sum(len(buf) for _, buf in list(self._buffers))
+        return count + (self._status is not None)
+    
+    def _drain(self):
+        """
+        Take everything buffered by every thread and send it.
+        """
+        entries = []
+        for _, buf in list(self._buffers):
+            # The owner appends on the right and this thread pops on the left;
+            # both are atomic on a deque, so no lock is needed. Another drainer
+            # may empty the buffer first, so stop when it runs out.
+            for _ in range(len(buf)):
+                try:
+                    entries.append(buf.popleft())
+                except IndexError:
+                    break
+        
+        with self._status_lock:
+            status, self._status = self._status, None
+        
+        # Forget buffers of threads that have exited and have nothing left
+        with self._registry_lock:
+            self._buffers = [(ref, buf) for ref, buf in self._buffers if buf or ref() is not None]
+        
+        for start in range(0, len(entries), self.max_batch):
+            self._send(entries[start:start + self.max_batch], None)
+        if status:
+            self._send([], status)
+    
+    def _send(self, entries: List[Dict[str, Any]], status):
+        try:
+            if entries:
+                self.client.send_logs(entries)
+            if status:
+                self.client.update_status(*status)
+        except Exception as e:
+            # Network errors are already handled by the client. Anything else
+            # (an unencodable payload, a compression or request-preparation
+            # error) only loses this batch and must not end the batch thread
+            self.client._send_failed(f"Log batch error: {e}")
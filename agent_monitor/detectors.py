@@ -6,14 +6,20 @@ and others to enable zero-configuration monitoring setup.
 """
 
 import sys
+import functools
 import importlib
 from typing import Optional, Dict, Any, List
 
 
+@functools.lru_cache(maxsize=1)
 def detect_framework() -> Dict[str, Any]:
     """
     Automatically detect which AI framework is being used.
     
+    Installed frameworks don't change while the process runs, so the result
+    is cached and shared by every caller: treat it as read-only. Call
+    detect_framework.cache_clear() to force a fresh detection.
+    
     Returns:
         Dict containing framework information:
         - name: Framework name ('langchain', 'langgraph', 'custom', etc.)
@@ -9,15 +9,40 @@ import os
 import sys
 import atexit
 import socket
-from typing import Optional, Dict, Any, Callable
+import functools
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple
 from uuid import uuid4
 
-from .client import AgentClient, HeartbeatThread
+from .client import AgentClient, HeartbeatThread, LogBatcher
 from .detectors import detect_framework, get_environment_info
 from .exceptions import ConfigurationError, AgentMonitorError
 from .integrations import get_integration_for_framework
 
 
+# Event verbosity levels, lowest first. Plain ints keep the level check cheap.
+VERBOSE = 10
+STANDARD = 20
+CRITICAL = 50
+
+# Process-wide telemetry switch, see set_enabled(). Checked first thing in
+# every logging method so the disabled path does no other work.
+_enabled = True
+
+
+def set_enabled(enabled: bool):
+    """
+    Turn sending of logs, metrics and status updates on or off for every monitor.
+    
+    Agent registration, heartbeats and the offline update on stop are not
+    affected, so a disabled agent still shows up on the dashboard.
+    
+    Args:
+        enabled: False to make all logging methods return immediately
+    """
+    global _enabled
+    _enabled = enabled
+
+
 class AgentMonitor:
     """
     Main monitoring class that provides comprehensive agent monitoring capabilities.
@@ -44,7 +69,12 @@ class AgentMonitor:
         group_id: str = "default",
         heartbeat_interval: int = 30,
         auto_detect: bool = True,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        flush_interval: float = 5.0,
+        max_batch: int = 100,
+        max_queue: int = 10000,
+        min_level: int = STANDARD,
+        compress: bool = False
     ):
         """
         Initialize the agent monitor.
@@ -57,6 +87,11 @@ class AgentMonitor:
             heartbeat_interval: Seconds between heartbeat signals
             auto_detect: Whether to automatically detect frameworks
             metadata: Additional metadata to include with the agent
+            flush_interval: Seconds between batched log submissions
+            max_batch: Number of buffered log entries that triggers an early flush
+            max_queue: Log entries buffered per logging thread before its oldest are dropped
+            min_level: Lowest level sent by the log_event_* helpers
+            compress: Send large log batches zstd-compressed (requires zstandard)
         """
         # Configuration
         self.dashboard_url = dashboard_url or os.getenv('AGENT_MONITOR_URL')
@@ -66,6 +101,11 @@ class AgentMonitor:
         self.heartbeat_interval = heartbeat_interval
         self.auto_detect = auto_detect
         self.metadata = metadata or {}
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self._min_level = min_level
+        self.compress = compress
         
         # Validation
         if not self.dashboard_url:
@@ -81,9 +121,11 @@ class AgentMonitor:
         # Internal state
         self.client = None
         self.heartbeat_thread = None
+        self.batcher = None
         self.framework_info = None
         self.integration = None
         self.is_started = False
+        self.session_id = None
         
         # Event handlers
         self.on_start = None
@@ -116,7 +158,8 @@ class AgentMonitor:
             # Initialize client
             self.client = AgentClient(
                 dashboard_url=self.dashboard_url,
-                api_key=self.api_key
+                api_key=self.api_key,
+                compress=self.compress
             )
             
             # Prepare metadata
@@ -143,6 +186,16 @@ class AgentMonitor:
                 )
                 self.heartbeat_thread.start()
             
+            # Logs and status updates are buffered and sent in batches
+            self.batcher = LogBatcher(
+                client=self.client,
+                flush_interval=self.flush_interval,
+                max_batch=self.max_batch,
+                max_queue=self.max_queue
+            )
+            self.batcher.start()
+            self._specialize_logging()
+            
             # Setup framework integration
             if self.framework_info and self.framework_info.get('available'):
                 self.integration = get_integration_for_framework(
@@ -181,6 +234,12 @@ class AgentMonitor:
             if self.integration:
                 self.integration.cleanup()
             
+            # Send anything still buffered
+            if self.batcher:
+                self._unspecialize_logging()
+                self.batcher.stop()
+                self.batcher = None
+            
             # Stop heartbeat
             if self.heartbeat_thread:
                 self.heartbeat_thread.stop()
@@ -200,6 +259,44 @@ class AgentMonitor:
         except Exception as e:
             print(f"Error during monitoring shutdown: {e}")
     
+    def start_session(self, metadata: Optional[Dict] = None) -> str:
+        """
+        Begin a monitoring session, starting the monitor first if needed.
+        
+        The session start is queued like any other event rather than sent on
+        its own, so it reaches the dashboard in the same request as the
+        session's first logs.
+        
+        Args:
+            metadata: Additional session data
+            
+        Returns:
+            str: The agent ID assigned by the dashboard
+        """
+        if not self.is_started:
+            self.start()
+        
+        self.session_id = uuid4().hex
+        self.log_event("session_start", {'session_id': self.session_id, **(metadata or {})})
+        return self.client.agent_id
+    
+    def end_session(self, metadata: Optional[Dict] = None):
+        """
+        End the current monitoring session.
+        
+        The session end is sent with the session's last batch of logs. The
+        monitor keeps running, so another session can be started.
+        
+        Args:
+            metadata: Additional session data
+        """
+        if not self.session_id:
+            return
+        
+        self.log_event("session_end", {'session_id': self.session_id, **(metadata or {})})
+        self.session_id = None
+        self.flush()
+    
     def log(self, level: str, message: str, metadata: Optional[Dict] = None):
         """
         Send a log message to the dashboard.
@@ -209,10 +306,16 @@ class AgentMonitor:
             message: Log message content
             metadata: Additional structured data
         """
+        if not _enabled:
+            return
         if not self.client:
             print(f"[{level.upper()}] {message}")  # Fallback to console
             return
         
+        if self.batcher:
+            self.batcher.add([{'message_type': level, 'message': message, 'metadata': metadata}])
+            return
+        
         try:
             self.client.send_log(
                 message_type=level,
@@ -222,6 +325,143 @@ class AgentMonitor:
         except Exception as e:
             print(f"Failed to send log: {e}")
     
+    def log_metric(self, name: str, value: float, unit: Optional[str] = None,
+                   metadata: Optional[Dict] = None):
+        """
+        Record a numeric metric.
+        
+        Args:
+            name: Metric name
+            value: Metric value
+            unit: Unit of measurement (e.g. 'seconds', 'USD')
+            metadata: Additional metric context
+        """
+        if not _enabled:
+            return
+        self.log("metric", name, {'value': value, 'unit': unit, **(metadata or {})})
+    
+    def log_metrics_bulk(self, metrics: Dict[str, Tuple[float, str]]):
+        """
+        Record several metrics with a single dashboard request.
+        
+        Args:
+            metrics: Mapping of metric name to a (value, unit) tuple
+        """
+        if not _enabled:
+            return
+        self.log_batch(metrics=metrics)
+    
+    def log_metric_samples(self, samples: Iterable[Tuple[int, Dict[str, Tuple[float, str]]]]):
+        """
+        Record metrics sampled earlier, each row keeping its own timestamp.
+        
+        Args:
+            samples: (timestamp_ns, metrics) pairs, where timestamp_ns is epoch
+                nanoseconds as returned by time.time_ns() and metrics maps
+                metric name to a (value, unit) tuple
+        """
+        if not _enabled:
+            return
+        
+        if not self.client:
+            # Fallback to console
+            for _, metrics in samples:
+                for name, (value, unit) in metrics.items():
+                    print(f"[METRIC] {name}: {value} {unit}")
+            return
+        
+        self._send_entries([
+            {'message_type': 'metric', 'message': name,
+             'metadata': {'value': value, 'unit': unit}, 'timestamp_ns': timestamp_ns}
+            for timestamp_ns, metrics in samples
+            for name, (value, unit) in metrics.items()
+        ])
+    
+    def log_event(self, event_type: str, data: Optional[Dict] = None):
+        """
+        Record an agent event.
+        
+        Args:
+            event_type: Type of event (e.g. 'decision', 'completion')
+            data: Event-specific data
+        """
+        if not _enabled:
+            return
+        self.log("event", event_type, data)
+    
+    def log_event_lazy(self, event_type: str, level: int, data_supplier: Callable[[], Dict]):
+        """
+        Record an agent event whose data is only built if the level is enabled.
+        
+        Args:
+            event_type: Type of event
+            level: Event level (VERBOSE, STANDARD or CRITICAL)
+            data_supplier: Zero-argument callable returning the event data
+        """
+        if not _enabled or level < self._min_level:
+            return
+        self.log_event(event_type, data_supplier())
+    
+    def log_event_verbose(self, event_type: str, data_supplier: Callable[[], Dict]):
+        """Record a VERBOSE event; see log_event_lazy."""
+        self.log_event_lazy(event_type, VERBOSE, data_supplier)
+    
+    def log_event_standard(self, event_type: str, data_supplier: Callable[[], Dict]):
+        """Record a STANDARD event; see log_event_lazy."""
+        self.log_event_lazy(event_type, STANDARD, data_supplier)
+    
+    def log_event_critical(self, event_type: str, data_supplier: Callable[[], Dict]):
+        """Record a CRITICAL event; see log_event_lazy."""
+        self.log_event_lazy(event_type, CRITICAL, data_supplier)
+    
+    def log_batch(
+        self,
+        *,
+        events: Iterable[Tuple[str, Optional[Dict]]] = (),
+        metrics: Dict[str, Tuple[float, Optional[str]]] = None
+    ):
+        """
+        Record events and metrics together with a single dashboard request.
+        
+        Args:
+            events: (event_type, data) pairs
+            metrics: Mapping of metric name to a (value, unit) tuple
+        """
+        if not _enabled:
+            return
+        metrics = metrics or {}
+        
+        if not self.client:
+            # Fallback to console
+            for event_type, data in events:
+                print(f"[EVENT] {event_type}: {data}")
+            for name, (value, unit) in metrics.items():
+                print(f"[METRIC] {name}: {value} {unit}")
+            return
+        
+        entries = [
+            {'message_type': 'event', 'message': event_type, 'metadata': data}
+            for event_type, data in events
+        ]
+        entries.extend(
+            {'message_type': 'metric', 'message': name, 'metadata': {'value': value, 'unit': unit}}
+            for name, (value, unit) in metrics.items()
+        )
+        self._send_entries(entries)
+    
+    def _send_entries(self, entries: List[Dict[str, Any]]):
+        """
+        Hand log entries to the batcher, or send them right away without one.
+        """
+        if self.batcher:
+            self.batcher.add(entries)
+            return
+        
+        try:
+            self.client.send_logs(entries)
+        except Exception as e:
+            print(f"Failed to send log batch: {e}")
+    
     def trace(self, operation: str, metadata: Optional[Dict] = None):
         """
         Log an execution trace.
@@ -230,6 +470,8 @@ class AgentMonitor:
             operation: Description of the operation being traced
             metadata: Additional trace data
         """
+        if not _enabled:
+            return
         self.log("trace", operation, metadata)
     
     def error(self, error: Exception, metadata: Optional[Dict] = None):
@@ -240,6 +482,8 @@ class AgentMonitor:
             error: The exception that occurred
             metadata: Additional error context
         """
+        if not _enabled:
+            return
         error_metadata = {
             'error_type': type(error).__name__,
             'error_message': str(error),
@@ -256,9 +500,62 @@ class AgentMonitor:
             status: New status ('running', 'idle', 'error', 'offline')
             metadata: Additional status metadata
         """
-        if self.client:
+        if not _enabled:
+            return
+        if self.batcher:
+            self.batcher.set_status(status, metadata)
+        elif self.client:
             self.client.update_status(status, metadata)
     
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send all buffered logs and status updates to the dashboard now.
+        
+        Args:
+            timeout: Maximum seconds to wait, or None to wait until done
+            
+        Returns:
+            bool: True if everything buffered was sent within the timeout
+        """
+        if self.batcher:
+            return self.batcher.flush(timeout)
+        return True
+    
+    def _specialize_logging(self):
+        """
+        Install per-instance log_event and log_metric bound to the running batcher.
+        
+        The hot logging calls then go straight to the batcher's buffer instead
+        of through log() and its client and batcher checks. Only the global
+        enable switch is still tested per call, since it can change at any time.
+        """
+        add = self.batcher.add
+        
+        @functools.wraps(AgentMonitor.log_event)
+        def log_event(event_type: str, data: Optional[Dict] = None):
+            if _enabled:
+                add([{'message_type': 'event', 'message': event_type, 'metadata': data}])
+        
+        @functools.wraps(AgentMonitor.log_metric)
+        def log_metric(name: str, value: float, unit: Optional[str] = None,
+                       metadata: Optional[Dict] = None):
+            if _enabled:
+                add([{
+                    'message_type': 'metric',
+                    'message': name,
+                    'metadata': {'value': value, 'unit': unit, **(metadata or {})}
+                }])
+        
+        self.log_event = log_event
+        self.log_metric = log_metric
+    
+    def _unspecialize_logging(self):
+        """
+        Go back to the class's generic log_event and log_metric.
+        """
+        self.__dict__.pop('log_event', None)
+        self.__dict__.pop('log_metric', None)
+    
     def _generate_agent_name(self) -> str:
         """
         Generate a default agent name based on the environment.
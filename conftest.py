@@ -0,0 +1,78 @@
+"""
+Shared pytest fixtures for the agent-monitor test scripts.
+"""
+
+import json
+from unittest import mock
+
+import pytest
+import requests
+
+
+class FakeDashboard:
+    """
+    Stands in for the dashboard API: records every request the client sends
+    and answers each one with 201 Created. With reject_zstd set, zstd-encoded
+    bodies are answered with 415 and recorded in rejected instead.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.rejected = []
+        self.reject_zstd = False
+
+    def send(self, request, **kwargs):
+        if self.reject_zstd and request.headers.get('Content-Encoding') == 'zstd':
+            self.rejected.append(request)
+            status_code = 415
+        else:
+            self.requests.append(request)
+            status_code = 201
+
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = b""
+        response.request = request
+        response.url = request.url
+        return response
+
+    def logs(self):
+        """
+        All rows posted to the agent_logs table, in the order they were sent.
+        """
+        rows = []
+        for request in self.requests:
+            if request.method == 'POST' and request.url.endswith('/agent_logs'):
+                body = request.body
+                if request.headers.get('Content-Encoding') == 'zstd':
+                    import zstandard
+                    body = zstandard.ZstdDecompressor().decompress(body)
+                body = json.loads(body)
+                rows.extend(body if isinstance(body, list) else [body])
+        return rows
+
+    def messages(self, message_type):
+        """
+        Messages of the posted log rows with the given message_type.
+        """
+        return [row['message'] for row in self.logs() if row['message_type'] == message_type]
+
+    def statuses(self):
+        """
+        Statuses sent as agent updates, in order.
+        """
+        return [json.loads(request.body)['status'] for request in self.requests if request.method == 'PATCH']
+
+
+@pytest.fixture(scope="module")
+def dashboard():
+    """
+    Route all HTTP traffic of the module's tests to a FakeDashboard.
+    """
+    fake = FakeDashboard()
+
+    def send(session, request, **kwargs):
+        return fake.send(request, **kwargs)
+
+    with mock.patch.object(requests.Session, "send", send):
+        yield fake
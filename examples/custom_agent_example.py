@@ -6,9 +6,12 @@ This example demonstrates how to use agent-monitor with a custom agent
 implementation, showing detailed monitoring of agent internals.
 """
 
+import io
+import sys
 import time
 import random
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 import agent_monitor
 from agent_monitor import AgentMonitor
@@ -21,8 +24,16 @@ class CustomTradingAgent:
         self.balance = initial_balance
         self.portfolio = {}
         self.trade_history = []
+        self._next_trade_id = 0
         self.risk_tolerance = 0.1  # 10% risk tolerance
         
+        # Holdings value is only recomputed after the portfolio changes
+        self._pf_dirty = True
+        self._pf_value_cache = None
+        
+        # Console output is buffered and written once per trading cycle
+        self._out = io.StringIO()
+        
         # Initialize monitoring
         self.monitor = AgentMonitor(
             agent_id=agent_id,
@@ -35,19 +46,30 @@ class CustomTradingAgent:
             }
         )
         
+    def _say(self, msg: str):
+        """Buffer a line of console output"""
+        self._out.write(msg + "\n")
+        
+    def _flush_output(self):
+        """Write buffered console output in a single call"""
+        sys.stdout.write(self._out.getvalue())
+        sys.stdout.flush()
+        self._out.seek(0)
+        self._out.truncate()
+        
     def start_trading_session(self):
         """Start a new trading session"""
-        print(f"🚀 Starting trading session for agent {self.agent_id}")
-        self.monitor.start_session()
-        self.monitor.log_event("session_start", {
+        self._say(f"🚀 Starting trading session for agent {self.agent_id}")
+        self.monitor.start_session({
             "starting_balance": self.balance,
             "portfolio_size": len(self.portfolio),
             "risk_tolerance": self.risk_tolerance
         })
+        self._flush_output()
         
     def analyze_market(self, symbol: str) -> Dict[str, Any]:
         """Analyze market conditions for a given symbol"""
-        print(f"  📊 Analyzing market for {symbol}...")
+        self._say(f"  📊 Analyzing market for {symbol}...")
         
         # Simulate market analysis
         time.sleep(random.uniform(0.5, 1.5))
@@ -86,10 +108,11 @@ class CustomTradingAgent:
             
     def execute_trade(self, symbol: str, action: str, quantity: int, price: float) -> bool:
         """Execute a trade based on the decision"""
-        print(f"  💰 Executing {action} order: {quantity} shares of {symbol} at ${price:.2f}")
+        self._say(f"  💰 Executing {action} order: {quantity} shares of {symbol} at ${price:.2f}")
         
         trade_value = quantity * price
-        trade_id = len(self.trade_history) + 1
+        self._next_trade_id += 1
+        trade_id = self._next_trade_id
         
         try:
             if action == 'BUY':
@@ -98,6 +121,7 @@ class CustomTradingAgent:
                     
                 self.balance -= trade_value
                 self.portfolio[symbol] = self.portfolio.get(symbol, 0) + quantity
+                self._pf_dirty = True
                 
             elif action == 'SELL':
                 if symbol not in self.portfolio or self.portfolio[symbol] < quantity:
@@ -107,6 +131,7 @@ class CustomTradingAgent:
                 self.portfolio[symbol] -= quantity
                 if self.portfolio[symbol] == 0:
                     del self.portfolio[symbol]
+                self._pf_dirty = True
             
             # Record successful trade
             trade_record = {
@@ -128,7 +153,7 @@ class CustomTradingAgent:
             self.monitor.log_metric("portfolio_value", self._calculate_portfolio_value(), "USD")
             self.monitor.log_metric("cash_balance", self.balance, "USD")
             
-            print(f"    ✅ Trade completed successfully (Trade ID: {trade_id})")
+            self._say(f"    ✅ Trade completed successfully (Trade ID: {trade_id})")
             return True
             
         except Exception as e:
@@ -145,19 +170,23 @@ class CustomTradingAgent:
             }
             
             self.monitor.log_event("trade_error", error_record)
-            print(f"    ❌ Trade failed: {e}")
+            self._say(f"    ❌ Trade failed: {e}")
             return False
             
     def _calculate_portfolio_value(self) -> float:
         """Calculate total portfolio value (simplified)"""
+        if not self._pf_dirty and self._pf_value_cache is not None:
+            return self.balance + self._pf_value_cache
+        
         # In a real scenario, you'd fetch current market prices
-        portfolio_value = sum(quantity * random.uniform(50, 500) 
-                            for quantity in self.portfolio.values())
-        return self.balance + portfolio_value
+        self._pf_value_cache = sum(quantity * random.uniform(50, 500) 
+                                   for quantity in self.portfolio.values())
+        self._pf_dirty = False
+        return self.balance + self._pf_value_cache
         
     def make_trading_decision(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Make a trading decision based on market analysis"""
-        print(f"\n🎯 Making trading decision for {symbol}")
+        self._say(f"\n🎯 Making trading decision for {symbol}")
         
         # Analyze the market
         analysis = self.analyze_market(symbol)
@@ -207,81 +236,95 @@ class CustomTradingAgent:
             
         # Log the final decision
         self.monitor.log_event("trading_decision", decision)
-        print(f"  🧠 Decision: {decision['action']} - {decision['rationale']}")
+        self._say(f"  🧠 Decision: {decision['action']} - {decision['rationale']}")
         
         return decision
         
     def run_trading_strategy(self, symbols: List[str], duration_minutes: int = 5):
         """Run the trading strategy for a specified duration"""
-        print(f"\n📈 Running trading strategy for {duration_minutes} minutes")
-        print(f"Monitoring symbols: {', '.join(symbols)}")
+        self._say(f"\n📈 Running trading strategy for {duration_minutes} minutes")
+        self._say(f"Monitoring symbols: {', '.join(symbols)}")
         
         start_time = time.time()
         end_time = start_time + (duration_minutes * 60)
         
         cycle_count = 0
         
-        while time.time() < end_time:
-            cycle_count += 1
-            print(f"\n--- Trading Cycle {cycle_count} ---")
-            
-            self.monitor.log_event("trading_cycle_start", {
-                "cycle_number": cycle_count,
-                "symbols_to_analyze": symbols,
-                "current_balance": self.balance,
-                "portfolio_positions": len(self.portfolio)
-            })
-            
-            cycle_start = time.time()
-            
-            for symbol in symbols:
-                try:
-                    # Make trading decision
-                    decision = self.make_trading_decision(symbol)
-                    
-                    # Execute trade if decision is to buy or sell
-                    if decision['action'] in ['BUY', 'SELL']:
-                        success = self.execute_trade(
-                            decision['symbol'],
-                            decision['action'],
-                            decision['quantity'],
-                            decision['price']
-                        )
-                        
-                        if success:
-                            self.monitor.log_metric("successful_trades", 1, "count")
-                        else:
-                            self.monitor.log_metric("failed_trades", 1, "count")
-                    
-                    # Brief pause between symbols
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    self.monitor.log_event("strategy_error", {
-                        "symbol": symbol,
-                        "cycle": cycle_count,
-                        "error": str(e),
-                        "error_type": type(e).__name__
-                    })
-                    print(f"  ⚠️ Error processing {symbol}: {e}")
-            
-            cycle_duration = time.time() - cycle_start
-            self.monitor.log_metric("cycle_duration", cycle_duration, "seconds")
-            
-            # Update agent status
-            portfolio_value = self._calculate_portfolio_value()
-            self.monitor.update_status("running")
-            self.monitor.log_metric("total_portfolio_value", portfolio_value, "USD")
-            
-            print(f"\n💼 End of cycle {cycle_count}:")
-            print(f"   Cash Balance: ${self.balance:.2f}")
-            print(f"   Portfolio Value: ${portfolio_value:.2f}")
-            print(f"   Total Trades: {len(self.trade_history)}")
-            
-            # Wait before next cycle (simulate real-time trading intervals)
-            time.sleep(random.uniform(10, 30) if duration_minutes > 2 else 2)
+        # Market analysis is I/O-bound and independent per symbol, so it runs
+        # concurrently; trades still execute serially since they share the balance
+        with ThreadPoolExecutor(max_workers=len(symbols)) as pool:
+            while time.time() < end_time:
+                cycle_count += 1
+                self._say(f"\n--- Trading Cycle {cycle_count} ---")
+
+                self.monitor.log_event("trading_cycle_start", {
+                    "cycle_number": cycle_count,
+                    "symbols_to_analyze": symbols,
+                    "current_balance": self.balance,
+                    "portfolio_positions": len(self.portfolio)
+                })
+
+                cycle_start = time.time()
+
+                decisions = list(pool.map(self._decide, symbols))
+
+                for symbol, decision, error in decisions:
+                    try:
+                        if error is not None:
+                            raise error
+
+                        # Execute trade if decision is to buy or sell
+                        if decision['action'] in ['BUY', 'SELL']:
+                            success = self.execute_trade(
+                                decision['symbol'],
+                                decision['action'],
+                                decision['quantity'],
+                                decision['price']
+                            )
+
+                            if success:
+                                self.monitor.log_metric("successful_trades", 1, "count")
+                            else:
+                                self.monitor.log_metric("failed_trades", 1, "count")
+
+                    except Exception as e:
+                        self.monitor.log_event("strategy_error", {
+                            "symbol": symbol,
+                            "cycle": cycle_count,
+                            "error": str(e),
+                            "error_type": type(e).__name__
+                        })
+                        self._say(f"  ⚠️ Error processing {symbol}: {e}")
+
+                cycle_duration = time.time() - cycle_start
+
+                # Update agent status
+                portfolio_value = self._calculate_portfolio_value()
+                self.monitor.update_status("running")
+                self.monitor.log_metrics_bulk({
+                    "cycle_duration": (cycle_duration, "seconds"),
+                    "total_portfolio_value": (portfolio_value, "USD"),
+                    "cash_balance": (self.balance, "USD")
+                })
+
+                self._say(f"\n💼 End of cycle {cycle_count}:")
+                self._say(f"   Cash Balance: ${self.balance:.2f}")
+                self._say(f"   Portfolio Value: ${portfolio_value:.2f}")
+                self._say(f"   Total Trades: {len(self.trade_history)}")
+                self._flush_output()
+
+                # Wait before next cycle (simulate real-time trading intervals)
+                time.sleep(random.uniform(10, 30) if duration_minutes > 2 else 2)
+
+        self._say(f"\n🏁 Trading strategy completed after {cycle_count} cycles")
+        self._flush_output()
         
-        print(f"\n🏁 Trading strategy completed after {cycle_count} cycles")
+    def _decide(self, symbol: str):
+        """Make a trading decision, capturing any error for the serial trade loop"""
+        try:
+            return symbol, self.make_trading_decision(symbol), None
+        except Exception as e:
+            return symbol, None, e
         
     def end_trading_session(self):
         """End the current trading session"""
@@ -298,17 +341,17 @@ class CustomTradingAgent:
             "session_duration": time.time()
         }
         
-        print(f"\n🎯 Trading session summary:")
-        print(f"   Final Cash Balance: ${final_balance:.2f}")
-        print(f"   Final Portfolio Value: ${final_portfolio_value:.2f}")
-        print(f"   Total Trades Executed: {total_trades}")
-        print(f"   Active Positions: {len(self.portfolio)}")
+        self._say(f"\n🎯 Trading session summary:")
+        self._say(f"   Final Cash Balance: ${final_balance:.2f}")
+        self._say(f"   Final Portfolio Value: ${final_portfolio_value:.2f}")
+        self._say(f"   Total Trades Executed: {total_trades}")
+        self._say(f"   Active Positions: {len(self.portfolio)}")
         
-        self.monitor.log_event("session_end", session_summary)
         self.monitor.update_status("completed")
-        self.monitor.end_session()
+        self.monitor.end_session(session_summary)
         
-        print("\n✅ Trading session ended. Check dashboard for detailed analytics!")
+        self._say("\n✅ Trading session ended. Check dashboard for detailed analytics!")
+        self._flush_output()
 
 def main():
     print("Custom Agent Monitoring Example")
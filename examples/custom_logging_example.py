@@ -7,6 +7,7 @@ when you want full control over what gets monitored.
 
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from agent_monitor import AgentMonitor
 
 def simulate_data_processing(monitor, data_batch):
@@ -179,13 +180,25 @@ def main():
             {"name": "notification_service", "endpoint": "/api/v1/notify"}
         ]
         
-        for api in apis_to_call:
+        def _call_one(api):
             try:
-                print(f"Calling {api['name']}...")
-                response = simulate_external_api_call(monitor, api['name'], api['endpoint'])
-                print(f"✓ {api['name']} responded successfully")
+                return api['name'], simulate_external_api_call(monitor, api['name'], api['endpoint'])
             except Exception as e:
-                print(f"✗ {api['name']} failed: {e}")
+                return api['name'], e
+        
+        # The calls are independent, so overlap their latency
+        with ThreadPoolExecutor(max_workers=len(apis_to_call)) as executor:
+            futures = []
+            for api in apis_to_call:
+                print(f"Calling {api['name']}...")
+                futures.append(executor.submit(_call_one, api))
+            
+            for future in as_completed(futures):
+                name, outcome = future.result()
+                if isinstance(outcome, Exception):
+                    print(f"✗ {name} failed: {outcome}")
+                else:
+                    print(f"✓ {name} responded successfully")
         
         # 3. Custom metrics and performance logging
         print("\n3. Logging custom metrics...")
@@ -6,11 +6,18 @@ This example demonstrates how to use agent-monitor with LangChain agents.
 The monitoring automatically tracks agent decisions, tool usage, and performance.
 """
 
+import re
+import ast
 import time
 import random
+import functools
 import agent_monitor
 from typing import Dict, List, Any
 
+# Tool routing in a single pass. The anchored lookahead keeps "weather" taking
+# priority over calculator keywords regardless of where it appears in the query.
+_TOOL_RE = re.compile(r"^(?=.*(?P<weather>weather))|(?P<calc>calculate|[-+*/])", re.I | re.S)
+
 # Mock LangChain implementation for demonstration
 class OpenAI:
     def __init__(self, temperature=0):
@@ -36,14 +43,48 @@ def web_search_tool(query: str) -> str:
     time.sleep(random.uniform(0.5, 1.5))
     return f"Found 10 results for '{query}'. Top result: Sample web content about {query}"
 
+_CALC_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd
+)
+
+# Largest exponent accepted by the calculator; unbounded powers like
+# 9**9**9**9 would hang the process computing the result
+_MAX_EXPONENT = 100
+
+def _is_number_literal(node) -> bool:
+    """True for a numeric constant, optionally with a unary sign"""
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        node = node.operand
+    return isinstance(node, ast.Constant) and isinstance(node.value, (int, float))
+
+@functools.lru_cache(maxsize=256)
+def _compile_expression(expression: str):
+    """Parse and compile an arithmetic expression, rejecting anything else"""
+    tree = ast.parse(expression, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, _CALC_NODES):
+            raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+        ):
+            raise ValueError("Only numeric literals are allowed")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            if not (_is_number_literal(node.left) and _is_number_literal(node.right)):
+                raise ValueError("Powers must have literal base and exponent")
+            if abs(ast.literal_eval(node.right)) > _MAX_EXPONENT:
+                raise ValueError(f"Exponent larger than {_MAX_EXPONENT}")
+    return compile(tree, '<calc>', 'eval')
+
 def calculator_tool(expression: str) -> str:
     """Mock calculator tool"""
     print(f"  🧮 Calculating: {expression}")
     time.sleep(0.2)
     try:
-        result = eval(expression)  # Note: Don't use eval in production!
+        result = eval(_compile_expression(expression), {"__builtins__": {}}, {})
         return f"Result: {result}"
-    except:
+    except (ValueError, SyntaxError, ArithmeticError, RecursionError, MemoryError):
+        # RecursionError and MemoryError come from deeply nested input
         return "Error: Invalid mathematical expression"
 
 def weather_tool(location: str) -> str:
@@ -58,7 +99,10 @@ def weather_tool(location: str) -> str:
 
 class Agent:
     def __init__(self, tools: List[Tool], llm):
-        self.tools = {tool.name: tool for tool in tools}
+        # The tool set is fixed, so keep direct references for dispatch
+        self._web = next(t for t in tools if t.name == "web_search")
+        self._calc = next(t for t in tools if t.name == "calculator")
+        self._weather = next(t for t in tools if t.name == "weather")
         self.llm = llm
         
     def run(self, query: str) -> str:
@@ -69,15 +113,16 @@ class Agent:
         thought = self.llm(f"How should I respond to: {query}")
         
         # Simulate tool selection and usage
-        if "weather" in query.lower():
-            tool_name = "weather"
-        elif "calculate" in query.lower() or any(op in query for op in ["+", "-", "*", "/"]):
-            tool_name = "calculator"
+        m = _TOOL_RE.search(query)
+        if m and m.group("weather"):
+            tool = self._weather
+        elif m and m.group("calc"):
+            tool = self._calc
         else:
-            tool_name = "web_search"
+            tool = self._web
             
-        print(f"  🔧 Agent selected tool: {tool_name}")
-        tool_result = self.tools[tool_name].run(query)
+        print(f"  🔧 Agent selected tool: {tool.name}")
+        tool_result = tool.run(query)
         
         # Generate final response
         print("  💭 Agent generating final response...")
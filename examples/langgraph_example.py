@@ -6,9 +6,24 @@ This example demonstrates how to use agent-monitor with LangGraph workflows.
 The monitoring is automatically integrated when you initialize the monitor.
 """
 
+import copy
 import time
+import asyncio
+import inspect
+import contextvars
 import agent_monitor
-from typing import Dict, Any
+from collections import Counter, defaultdict
+from typing import Dict, Any, Optional
+
+# Name of the node being executed. Each task started by asyncio.gather gets
+# its own copy of the context, so concurrent nodes never see each other's value
+current_node: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_node", default=None)
+
+def log_node_event(event_type: str, data: Dict[str, Any]):
+    """Log an event tagged with the node that is currently executing"""
+    monitor = agent_monitor.get_global_monitor()
+    if monitor:
+        monitor.log_event(event_type, {**data, "node": current_node.get()})
 
 # Note: This is a mock LangGraph implementation for demonstration
 # In a real scenario, you would import from the actual langgraph package
@@ -25,6 +40,10 @@ class StateGraph:
         self.edges.append((from_node, to_node))
         
     def compile(self):
+        for from_node, to_node in self.edges:
+            for name in (from_node, to_node):
+                if name not in self.nodes:
+                    raise ValueError(f"Edge {from_node} -> {to_node} references unknown node '{name}'")
         return CompiledGraph(self.nodes, self.edges)
 
 class CompiledGraph:
@@ -33,16 +52,85 @@ class CompiledGraph:
         self.edges = edges
         
     def invoke(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        return asyncio.run(self.ainvoke(input_data))
+        
+    async def ainvoke(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         # Simulate graph execution
         state = input_data.copy()
         
-        # Execute nodes in order (simplified)
-        for node_name, node_func in self.nodes.items():
-            print(f"Executing node: {node_name}")
-            state = node_func(state)
-            time.sleep(0.5)  # Simulate processing time
+        indeg = Counter(to_node for _, to_node in self.edges)
+        adj = defaultdict(list)
+        for from_node, to_node in self.edges:
+            adj[from_node].append(to_node)
+        
+        # Nodes whose upstream nodes have all finished run together as a batch
+        done = set()
+        while len(done) < len(self.nodes):
+            batch = [n for n in self.nodes if indeg[n] == 0 and n not in done]
+            if not batch:
+                raise ValueError("Graph contains a cycle")
+            
+            # Each node works on its own copy, so siblings can't see or
+            # clobber each other's changes
+            results = await asyncio.gather(
+                *(self._run_node(node_name, copy.deepcopy(state)) for node_name in batch)
+            )
+            state = _merge_updates(state, dict(zip(batch, results)))
+            
+            for node_name in batch:
+                done.add(node_name)
+                for to_node in adj[node_name]:
+                    indeg[to_node] -= 1
             
         return state
+        
+    async def _run_node(self, node_name: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        token = current_node.set(node_name)
+        try:
+            print(f"Executing node: {current_node.get()}")
+            node_func = self.nodes[node_name]
+            start_time = time.perf_counter()
+            
+            # Async nodes are awaited directly; sync nodes must not block the loop
+            if inspect.iscoroutinefunction(node_func):
+                result = await node_func(state)
+            else:
+                # Executor threads don't inherit the context, so pass it along
+                loop = asyncio.get_running_loop()
+                ctx = contextvars.copy_context()
+                result = await loop.run_in_executor(None, ctx.run, node_func, state)
+            
+            await asyncio.sleep(0.5)  # Simulate processing time
+            log_node_event("node_completed", {"duration": time.perf_counter() - start_time})
+            return result
+        finally:
+            current_node.reset(token)
+
+def _merge_updates(state: Dict[str, Any], results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge the states returned by a batch of nodes into the state they started from.
+    
+    Only keys a node changed are merged. Items appended to a list by several
+    nodes are all kept, in batch order; any other key changed by more than
+    one node is a conflict.
+    """
+    merged = dict(state)
+    changed_by = {}
+    for node_name, result in results.items():
+        for key, value in result.items():
+            if key in state and state[key] == value:
+                continue
+            old = state.get(key)
+            if isinstance(old, list) and isinstance(value, list) and value[:len(old)] == old:
+                merged[key] = merged[key] + value[len(old):]
+                continue
+            if key in changed_by:
+                raise ValueError(
+                    f"Nodes '{changed_by[key]}' and '{node_name}' both updated '{key}' in parallel"
+                )
+            changed_by[key] = node_name
+            merged[key] = value
+    return merged
 
 # State schema for our workflow
 class WorkflowState:
@@ -51,7 +139,9 @@ class WorkflowState:
         self.current_step = 0
         self.results = {}
 
-def research_node(state: Dict[str, Any]) -> Dict[str, Any]:
+# Nodes are coroutines so that, in real usage, their LLM calls
+# (e.g. `await llm.ainvoke(...)`) overlap instead of blocking the event loop
+async def research_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """Research node that gathers information"""
     print("  📚 Gathering research data...")
     state['research_results'] = {
@@ -59,9 +149,10 @@ def research_node(state: Dict[str, Any]) -> Dict[str, Any]:
         'key_insights': ['Market trending up', 'Increased volatility', 'Strong fundamentals'],
         'confidence': 0.85
     }
+    log_node_event("research_completed", {"sources_found": 5})
     return state
 
-def analysis_node(state: Dict[str, Any]) -> Dict[str, Any]:
+async def analysis_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """Analysis node that processes the research"""
     print("  🔍 Analyzing research data...")
     research = state.get('research_results', {})
@@ -71,9 +162,10 @@ def analysis_node(state: Dict[str, Any]) -> Dict[str, Any]:
         'confidence_score': research.get('confidence', 0.5) * 0.9,
         'target_price': 150.00
     }
+    log_node_event("analysis_completed", {"recommendation": state['analysis_results']['recommendation']})
     return state
 
-def decision_node(state: Dict[str, Any]) -> Dict[str, Any]:
+async def decision_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """Decision node that makes the final recommendation"""
     print("  🎯 Making final decision...")
     analysis = state.get('analysis_results', {})
@@ -83,6 +175,7 @@ def decision_node(state: Dict[str, Any]) -> Dict[str, Any]:
         'rationale': 'Based on strong fundamentals and positive market trends',
         'expected_return': 0.15
     }
+    log_node_event("decision_made", {"action": state['final_decision']['action']})
     return state
 
 def main():
@@ -125,11 +218,11 @@ def main():
     
     # Execute the workflow - monitoring is automatic
     try:
-        result = app.invoke({
+        result = asyncio.run(app.ainvoke({
             "query": "Should I invest in AAPL stock?",
             "user_id": "investor_123",
             "timestamp": time.time()
-        })
+        }))
         
         print("\n🎉 Workflow completed successfully!")
         print("\nFinal Results:")
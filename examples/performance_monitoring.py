@@ -6,25 +6,94 @@ This example demonstrates how to use agent-monitor for detailed performance
 tracking and optimization of AI agent operations.
 """
 
+import os
+import math
+import functools
 import time
 import random
 import psutil
+import tempfile
 import threading
-from typing import Dict, List, Any
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
 import agent_monitor
 from agent_monitor import AgentMonitor
 
+# Numba is optional and can be switched off with AGENT_MONITOR_DISABLE_JIT=1;
+# without it the CPU kernel falls back to NumPy
+njit = None
+if not os.environ.get("AGENT_MONITOR_DISABLE_JIT"):
+    try:
+        from numba import njit
+    except ImportError:
+        pass
+
+_JIT_ENABLED = njit is not None
+
+# Metric name and unit for each column of the tracker's sample buffer
+TRACKED_METRICS = [
+    ("cpu_usage", "percentage"),
+    ("memory_usage", "percentage"),
+    ("memory_available", "GB"),
+    ("disk_read_mb", "MB"),
+    ("disk_write_mb", "MB"),
+]
+
+# 1 KiB row of the repeating 0..255 byte pattern used by the memory benchmark
+_FILL_PATTERN = np.tile(np.arange(256, dtype=np.uint8), 4)
+
+class _PsCache:
+    """Thread-safe psutil snapshots shared by all callers for a short TTL"""
+    
+    def __init__(self, ttl: float = 0.25):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cpu = (0.0, None)
+        self._mem = (0.0, None)
+        
+        # Prime the CPU counters so later non-blocking samples report the
+        # utilisation since the previous call instead of sleeping to measure it
+        psutil.cpu_percent(interval=None)
+        
+    def get_cpu(self) -> float:
+        """CPU utilisation percentage"""
+        with self._lock:
+            now = time.monotonic()
+            taken_at, value = self._cpu
+            if value is None or now - taken_at >= self.ttl:
+                value = psutil.cpu_percent(interval=None)
+                self._cpu = (now, value)
+            return value
+            
+    def get_mem(self, fresh: bool = False):
+        """psutil.virtual_memory() snapshot; fresh=True always takes a new one"""
+        with self._lock:
+            now = time.monotonic()
+            taken_at, value = self._mem
+            if fresh or value is None or now - taken_at >= self.ttl:
+                value = psutil.virtual_memory()
+                self._mem = (now, value)
+            return value
+
+_ps_cache = _PsCache()
+
 class PerformanceTracker:
     """Helper class to track system performance metrics"""
     
-    def __init__(self, monitor: AgentMonitor):
+    def __init__(self, monitor: AgentMonitor, batch_size: int = 30):
         self.monitor = monitor
-        self.tracking = False
         self.tracking_thread = None
+        self._stop = threading.Event()
+        
+        # Samples are buffered one row per tick and sent in a single call per batch
+        self._buf = np.empty((batch_size, len(TRACKED_METRICS)), dtype=np.float64)
+        self._ts = np.empty(batch_size, dtype=np.int64)
+        self._i = 0
         
     def start_tracking(self, interval: float = 1.0):
         """Start background performance tracking"""
-        self.tracking = True
+        self._stop.clear()
         self.tracking_thread = threading.Thread(
             target=self._track_performance, 
             args=(interval,),
@@ -34,38 +103,97 @@ class PerformanceTracker:
         
     def stop_tracking(self):
         """Stop background performance tracking"""
-        self.tracking = False
+        # Wakes the tracker out of its wait immediately instead of letting
+        # join() block for the rest of the interval
+        self._stop.set()
         if self.tracking_thread:
             self.tracking_thread.join()
+        self._flush_samples()
+        
+    def _flush_samples(self):
+        """Send all buffered samples to the monitor in one call"""
+        if not self._i:
+            return
+        
+        # One row per sample and metric, stamped with the tick it was taken on;
+        # metrics that weren't available on a tick are left out
+        self.monitor.log_metric_samples(
+            (timestamp_ns, {
+                name: (value, unit)
+                for value, (name, unit) in zip(row, TRACKED_METRICS)
+                if not math.isnan(value)
+            })
+            for timestamp_ns, row in zip(self._ts[:self._i].tolist(), self._buf[:self._i].tolist())
+        )
+        self._i = 0
             
     def _track_performance(self, interval: float):
         """Background thread function to track performance metrics"""
-        while self.tracking:
+        while not self._stop.is_set():
             try:
                 # CPU usage
-                cpu_percent = psutil.cpu_percent(interval=0.1)
-                self.monitor.log_metric("cpu_usage", cpu_percent, "percentage")
+                cpu_percent = _ps_cache.get_cpu()
                 
                 # Memory usage
-                memory = psutil.virtual_memory()
-                self.monitor.log_metric("memory_usage", memory.percent, "percentage")
-                self.monitor.log_metric("memory_available", memory.available / (1024**3), "GB")
+                memory = _ps_cache.get_mem()
                 
                 # Disk I/O (if available)
+                disk_read = disk_write = math.nan
                 try:
                     disk_io = psutil.disk_io_counters()
                     if disk_io:
-                        self.monitor.log_metric("disk_read_mb", disk_io.read_bytes / (1024**2), "MB")
-                        self.monitor.log_metric("disk_write_mb", disk_io.write_bytes / (1024**2), "MB")
-                except:
+                        disk_read = disk_io.read_bytes / (1024**2)
+                        disk_write = disk_io.write_bytes / (1024**2)
+                except OSError:
                     pass  # Disk I/O might not be available in some environments
+                
+                self._ts[self._i] = time.time_ns()
+                self._buf[self._i] = (
+                    cpu_percent,
+                    memory.percent,
+                    memory.available / (1024**3),
+                    disk_read,
+                    disk_write
+                )
+                self._i += 1
+                if self._i == len(self._buf):
+                    self._flush_samples()
                     
-                time.sleep(interval)
+                if self._stop.wait(interval):
+                    break
                 
             except Exception as e:
                 print(f"Performance tracking error: {e}")
                 break
 
+# Target wall time of a single CPU benchmark kernel call, in seconds
+CPU_CHUNK_SECONDS = 0.05
+
+if _JIT_ENABLED:
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _burn(n_outer, n_inner):
+        """CPU benchmark kernel: n_outer calculations of n_inner steps each"""
+        # A floating-point recurrence can't be folded into a closed form by the
+        # compiler, so the benchmark measures real arithmetic throughput
+        acc = 0.0
+        for i in range(n_outer):
+            for j in range(n_inner):
+                acc = acc * 1.0000001 + j * 0.5
+        return acc
+else:
+    @functools.lru_cache(maxsize=4)
+    def _dot_operands(n):
+        return np.arange(n, dtype=np.float64), np.random.random(n)
+    
+    def _burn(n_outer, n_inner):
+        """CPU benchmark kernel: n_outer calculations, each an n_inner-element dot product"""
+        # The inner loop runs in the vectorised BLAS dot instead of the interpreter
+        a, b = _dot_operands(n_inner)
+        acc = 0.0
+        for _ in range(n_outer):
+            acc += a @ b
+        return acc
+
 class PerformanceOptimizedAgent:
     """An agent designed to demonstrate performance monitoring capabilities"""
     
@@ -73,6 +201,9 @@ class PerformanceOptimizedAgent:
         self.agent_id = agent_id
         self.cache = {}
         self.operation_count = 0
+        self._op_lock = threading.Lock()
+        self._chunk_iters = None
+        self._mem_buf: Optional[np.ndarray] = None
         
         # Initialize monitoring
         self.monitor = AgentMonitor(
@@ -89,6 +220,11 @@ class PerformanceOptimizedAgent:
         # Initialize performance tracker
         self.perf_tracker = PerformanceTracker(self.monitor)
         
+        # Compile the JIT kernels in the background so the first benchmark
+        # doesn't include compilation time
+        if _JIT_ENABLED:
+            threading.Thread(target=_burn, args=(1, 1), daemon=True).start()
+        
     def start_monitoring_session(self):
         """Start a comprehensive monitoring session"""
         print(f"📈 Starting performance monitoring for agent {self.agent_id}")
@@ -107,8 +243,8 @@ class PerformanceOptimizedAgent:
         """Simulate a CPU-intensive operation"""
         print(f"  🔧 Executing CPU-intensive task: {task_name}")
         
-        start_time = time.time()
-        start_cpu = psutil.cpu_percent()
+        start_time = time.perf_counter()
+        start_cpu = _ps_cache.get_cpu()
         
         self.monitor.log_event("cpu_task_start", {
             "task_name": task_name,
@@ -116,45 +252,62 @@ class PerformanceOptimizedAgent:
             "initial_cpu_usage": start_cpu
         })
         
-        # Simulate CPU-intensive work
-        end_time = start_time + duration
+        # Simulate CPU-intensive work as a fixed number of calibrated chunks
+        chunk_iters = self._calibrate_cpu_chunk()
         calculations = 0
         
-        while time.time() < end_time:
-            # Perform some calculations
-            for i in range(1000):
-                _ = sum(range(100))
-                calculations += 1
-            time.sleep(0.01)  # Small pause to prevent excessive CPU usage
+        for _ in range(max(1, int(duration / CPU_CHUNK_SECONDS))):
+            _burn(chunk_iters, 100)
+            calculations += chunk_iters
             
-        execution_time = time.time() - start_time
-        final_cpu = psutil.cpu_percent()
+        execution_time = time.perf_counter() - start_time
+        final_cpu = _ps_cache.get_cpu()
         
-        self.monitor.log_event("cpu_task_completion", {
-            "task_name": task_name,
-            "actual_duration": execution_time,
-            "calculations_performed": calculations,
-            "final_cpu_usage": final_cpu,
-            "cpu_delta": final_cpu - start_cpu
-        })
-        
-        # Log performance metrics
-        self.monitor.log_metric("task_duration", execution_time, "seconds")
-        self.monitor.log_metric("calculations_per_second", calculations / execution_time, "ops/sec")
-        self.monitor.log_metric("cpu_efficiency", calculations / (final_cpu + 1), "ops/cpu_percent")
+        # Log the completion event and performance metrics together
+        self.monitor.log_batch(
+            events=[("cpu_task_completion", {
+                "task_name": task_name,
+                "actual_duration": execution_time,
+                "calculations_performed": calculations,
+                "final_cpu_usage": final_cpu,
+                "cpu_delta": final_cpu - start_cpu
+            })],
+            metrics={
+                "task_duration": (execution_time, "seconds"),
+                "calculations_per_second": (calculations / execution_time, "ops/sec"),
+                "cpu_efficiency": (calculations / (final_cpu + 1), "ops/cpu_percent")
+            }
+        )
         
         return {
             "duration": execution_time,
             "calculations": calculations,
-            "efficiency": calculations / execution_time
+            "efficiency": calculations / execution_time,
+            "status": "success"
         }
         
+    def _calibrate_cpu_chunk(self) -> int:
+        """Number of kernel iterations that take about CPU_CHUNK_SECONDS"""
+        if self._chunk_iters is None:
+            _burn(1, 1)  # Keep JIT compilation out of the measurement
+            
+            # Grow the sample until it runs for ~10 ms, then scale to a chunk
+            n_iters, elapsed = 50, 0.0
+            while elapsed < 0.01 and n_iters < 1 << 30:
+                n_iters *= 2
+                t0 = time.perf_counter()
+                _burn(n_iters, 100)
+                elapsed = time.perf_counter() - t0
+            self._chunk_iters = max(1, int(n_iters * CPU_CHUNK_SECONDS / max(elapsed, 1e-7)))
+        return self._chunk_iters
+        
     def simulate_memory_intensive_task(self, task_name: str, data_size_mb: int = 50):
         """Simulate a memory-intensive operation"""
         print(f"  💾 Executing memory-intensive task: {task_name} ({data_size_mb}MB)")
         
-        start_time = time.time()
-        start_memory = psutil.virtual_memory().percent
+        start_time = time.perf_counter()
+        # Before/after readings of one task must not share a cached sample
+        start_memory = _ps_cache.get_mem(fresh=True).percent
         
         self.monitor.log_event("memory_task_start", {
             "task_name": task_name,
@@ -163,39 +316,41 @@ class PerformanceOptimizedAgent:
         })
         
         try:
-            # Allocate memory
+            # Allocate memory once and reuse the largest buffer seen so far
             data_size_bytes = data_size_mb * 1024 * 1024
-            large_data = bytearray(data_size_bytes)
+            if self._mem_buf is None or self._mem_buf.nbytes < data_size_bytes:
+                self._mem_buf = np.empty(data_size_bytes, dtype=np.uint8)
+            large_data = self._mem_buf[:data_size_bytes]
             
-            # Perform operations on the data
-            for i in range(0, len(large_data), 1024):
-                large_data[i:i+1024] = bytes(range(256)) * 4
-                if i % (data_size_bytes // 10) == 0:  # Check progress
-                    current_memory = psutil.virtual_memory().percent
-                    progress = (i / data_size_bytes) * 100
-                    self.monitor.log_metric("memory_task_progress", progress, "percentage")
+            # Fill the data with the byte pattern, one 1 KiB row at a time, in two halves
+            half = data_size_bytes // 2
+            np.copyto(large_data[:half].reshape(-1, _FILL_PATTERN.size), _FILL_PATTERN, casting='no')
+            self.monitor.log_metric("memory_task_progress", 50.0, "percentage")
+            np.copyto(large_data[half:].reshape(-1, _FILL_PATTERN.size), _FILL_PATTERN, casting='no')
             
-            # Simulate some processing
-            time.sleep(0.5)
+            # Process the data: a full read pass over the buffer, so the
+            # throughput metric covers both writing and reading it
+            checksum = int(large_data.view(np.uint64).sum())
             
-            # Clean up
-            del large_data
+            execution_time = time.perf_counter() - start_time
+            final_memory = _ps_cache.get_mem(fresh=True).percent
             
-            execution_time = time.time() - start_time
-            final_memory = psutil.virtual_memory().percent
-            
-            self.monitor.log_event("memory_task_completion", {
-                "task_name": task_name,
-                "actual_duration": execution_time,
-                "data_processed_mb": data_size_mb,
-                "final_memory_usage": final_memory,
-                "memory_delta": final_memory - start_memory,
-                "status": "success"
-            })
-            
-            # Log performance metrics
-            self.monitor.log_metric("memory_throughput", data_size_mb / execution_time, "MB/sec")
-            self.monitor.log_metric("memory_efficiency", data_size_mb / (final_memory - start_memory + 1), "MB/percent")
+            # Log the completion event and performance metrics together
+            self.monitor.log_batch(
+                events=[("memory_task_completion", {
+                    "task_name": task_name,
+                    "actual_duration": execution_time,
+                    "data_processed_mb": data_size_mb,
+                    "checksum": checksum,
+                    "final_memory_usage": final_memory,
+                    "memory_delta": final_memory - start_memory,
+                    "status": "success"
+                })],
+                metrics={
+                    "memory_throughput": (data_size_mb / execution_time, "MB/sec"),
+                    "memory_efficiency": (data_size_mb / (final_memory - start_memory + 1), "MB/percent")
+                }
+            )
             
             return {
                 "duration": execution_time,
@@ -212,11 +367,18 @@ class PerformanceOptimizedAgent:
             })
             return {"status": "failed", "error": str(e)}
             
-    def simulate_io_intensive_task(self, task_name: str, file_count: int = 10):
-        """Simulate an I/O-intensive operation"""
+    def simulate_io_intensive_task(self, task_name: str, file_count: int = 10,
+                                   use_disk: bool = False, pacing: float = 0.0):
+        """
+        Simulate an I/O-intensive operation.
+        
+        Files are spooled in memory by default; pass use_disk=True to write
+        real files through unbuffered file descriptors instead. A non-zero
+        pacing adds that many seconds of delay after each file.
+        """
         print(f"  📁 Executing I/O-intensive task: {task_name} ({file_count} files)")
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         self.monitor.log_event("io_task_start", {
             "task_name": task_name,
@@ -228,45 +390,64 @@ class PerformanceOptimizedAgent:
         total_bytes = 0
         
         try:
-            for i in range(file_count):
-                filename = f"temp_perf_test_{i}.txt"
-                data = f"Performance test data for file {i}\n" * 100  # ~3KB per file
-                
-                # Write file
-                with open(filename, 'w') as f:
-                    f.write(data)
-                    
-                # Read file back
-                with open(filename, 'r') as f:
-                    read_data = f.read()
-                    
-                total_bytes += len(data.encode())
-                files_processed += 1
-                
-                # Clean up
-                import os
-                os.remove(filename)
+            payloads = [
+                f"Performance test data for file {i}\n".encode() * 100  # ~3KB per file
+                for i in range(file_count)
+            ]
+            filenames = [f"temp_perf_test_{i}.txt" for i in range(file_count)] if use_disk else []
+            progress_points = set(range(0, file_count, max(1, file_count // 5)))
+            fds = []
+            
+            try:
+                # Real files are all opened up front and removed in one sweep at the end
+                for filename in filenames:
+                    fds.append(os.open(filename, os.O_CREAT | os.O_RDWR | os.O_TRUNC, 0o600))
                 
-                # Log progress
-                if i % max(1, file_count // 5) == 0:
-                    progress = (i / file_count) * 100
-                    self.monitor.log_metric("io_task_progress", progress, "percentage")
+                for i, payload in enumerate(payloads):
+                    if use_disk:
+                        fd = fds[i]
+                        os.write(fd, payload)
+                        os.lseek(fd, 0, os.SEEK_SET)
+                        read_data = os.read(fd, len(payload))
+                    else:
+                        # Small files stay in memory unless they outgrow the spool size
+                        with tempfile.SpooledTemporaryFile(max_size=65536) as f:
+                            f.write(payload)
+                            f.seek(0)
+                            read_data = f.read()
+                        
+                    total_bytes += len(payload)
+                    files_processed += 1
                     
-                time.sleep(0.05)  # Small delay to simulate real I/O patterns
+                    # Log progress
+                    if i in progress_points:
+                        progress = (i / file_count) * 100
+                        self.monitor.log_metric("io_task_progress", progress, "percentage")
+                        
+                    if pacing:
+                        time.sleep(pacing)  # Optional delay to simulate real I/O patterns
+            finally:
+                for fd in fds:
+                    os.close(fd)
+                for filename in filenames[:len(fds)]:
+                    os.unlink(filename)
                 
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
-            self.monitor.log_event("io_task_completion", {
-                "task_name": task_name,
-                "actual_duration": execution_time,
-                "files_processed": files_processed,
-                "total_bytes": total_bytes,
-                "status": "success"
-            })
-            
-            # Log performance metrics
-            self.monitor.log_metric("io_throughput", total_bytes / execution_time, "bytes/sec")
-            self.monitor.log_metric("files_per_second", files_processed / execution_time, "files/sec")
+            # Log the completion event and performance metrics together
+            self.monitor.log_batch(
+                events=[("io_task_completion", {
+                    "task_name": task_name,
+                    "actual_duration": execution_time,
+                    "files_processed": files_processed,
+                    "total_bytes": total_bytes,
+                    "status": "success"
+                })],
+                metrics={
+                    "io_throughput": (total_bytes / execution_time, "bytes/sec"),
+                    "files_per_second": (files_processed / execution_time, "files/sec")
+                }
+            )
             
             return {
                 "duration": execution_time,
@@ -284,8 +465,13 @@ class PerformanceOptimizedAgent:
             })
             return {"status": "failed", "error": str(e)}
             
-    def run_performance_benchmarks(self):
-        """Run a comprehensive set of performance benchmarks"""
+    def run_performance_benchmarks(self, parallel: bool = True):
+        """
+        Run a comprehensive set of performance benchmarks.
+        
+        CPU, memory and I/O benchmarks exercise different subsystems, so each
+        group runs on its own worker thread unless parallel=False.
+        """
         print("\n🏁 Starting Performance Benchmarks")
         print("=====================================\n")
         
@@ -297,82 +483,116 @@ class PerformanceOptimizedAgent:
             {"type": "io", "name": "File Operations", "file_count": 15},
             {"type": "io", "name": "Batch Processing", "file_count": 20}
         ]
+        total = len(benchmarks)
         
-        results = []
+        if not parallel:
+            return [self._run_benchmark(i, benchmark, total)
+                    for i, benchmark in enumerate(benchmarks, 1)]
         
+        groups = {}
         for i, benchmark in enumerate(benchmarks, 1):
-            print(f"\n--- Benchmark {i}/{len(benchmarks)}: {benchmark['name']} ---")
-            
-            try:
-                if benchmark['type'] == 'cpu':
-                    result = self.simulate_cpu_intensive_task(
-                        benchmark['name'], 
-                        benchmark['duration']
-                    )
-                elif benchmark['type'] == 'memory':
-                    result = self.simulate_memory_intensive_task(
-                        benchmark['name'], 
-                        benchmark['size_mb']
-                    )
-                elif benchmark['type'] == 'io':
-                    result = self.simulate_io_intensive_task(
-                        benchmark['name'], 
-                        benchmark['file_count']
-                    )
-                    
-                result['benchmark'] = benchmark['name']
-                result['type'] = benchmark['type']
-                results.append(result)
-                
-                print(f"  ✅ Completed: {result.get('status', 'success')}")
-                
-                # Brief pause between benchmarks
-                time.sleep(1)
-                
-            except Exception as e:
-                print(f"  ❌ Failed: {e}")
-                results.append({
-                    "benchmark": benchmark['name'],
-                    "type": benchmark['type'],
-                    "status": "failed",
-                    "error": str(e)
-                })
+            groups.setdefault(benchmark['type'], []).append((i, benchmark))
+        
+        # Results keep the benchmark order regardless of which group finishes first
+        results = [None] * total
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [executor.submit(self._run_group, group, total) for group in groups.values()]
+            for future in futures:
+                for i, result in future.result():
+                    results[i - 1] = result
                 
         return results
         
+    def _run_group(self, group: List[tuple], total: int) -> List[tuple]:
+        """Run one group of benchmarks sequentially"""
+        return [(i, self._run_benchmark(i, benchmark, total)) for i, benchmark in group]
+        
+    def _run_benchmark(self, i: int, benchmark: Dict[str, Any], total: int) -> Dict[str, Any]:
+        """Run a single benchmark and tag its result"""
+        print(f"\n--- Benchmark {i}/{total}: {benchmark['name']} ---")
+        
+        try:
+            if benchmark['type'] == 'cpu':
+                result = self.simulate_cpu_intensive_task(
+                    benchmark['name'], 
+                    benchmark['duration']
+                )
+            elif benchmark['type'] == 'memory':
+                result = self.simulate_memory_intensive_task(
+                    benchmark['name'], 
+                    benchmark['size_mb']
+                )
+            elif benchmark['type'] == 'io':
+                result = self.simulate_io_intensive_task(
+                    benchmark['name'], 
+                    benchmark['file_count']
+                )
+                
+            result['benchmark'] = benchmark['name']
+            result['type'] = benchmark['type']
+            
+            with self._op_lock:
+                self.operation_count += 1
+            
+            # Groups run in parallel, so name the benchmark on every line
+            print(f"  ✅ Completed {i}/{total} {benchmark['name']}: {result.get('status', 'success')}")
+            return result
+            
+        except Exception as e:
+            print(f"  ❌ Failed {i}/{total} {benchmark['name']}: {e}")
+            return {
+                "benchmark": benchmark['name'],
+                "type": benchmark['type'],
+                "status": "failed",
+                "error": str(e)
+            }
+        
     def analyze_performance_results(self, results: List[Dict[str, Any]]):
         """Analyze and report on performance results"""
         print("\n📈 Performance Analysis")
         print("========================\n")
         
-        successful_benchmarks = [r for r in results if r.get('status') == 'success']
-        failed_benchmarks = [r for r in results if r.get('status') == 'failed']
+        # Columnar view of the results: a single pass over the dicts, then
+        # every aggregate is a boolean mask over these arrays
+        status = np.array([r.get('status') for r in results], dtype=object)
+        kind = np.array([r.get('type') for r in results], dtype=object)
+        score = np.array([r.get('efficiency', r.get('throughput', 0.0)) for r in results], dtype=np.float64)
+        
+        succeeded = status == 'success'
+        failed = status == 'failed'
+        by_type = {t: succeeded & (kind == t) for t in ('cpu', 'memory', 'io')}
+        
+        successful_count = int(succeeded.sum())
+        failed_benchmarks = [results[i] for i in np.flatnonzero(failed)]
         
         analysis = {
             "total_benchmarks": len(results),
-            "successful_benchmarks": len(successful_benchmarks),
+            "successful_benchmarks": successful_count,
             "failed_benchmarks": len(failed_benchmarks),
-            "success_rate": len(successful_benchmarks) / len(results) if results else 0,
+            "success_rate": successful_count / len(results) if results else 0,
             "performance_summary": {
-                "cpu_benchmarks": [r for r in successful_benchmarks if r['type'] == 'cpu'],
-                "memory_benchmarks": [r for r in successful_benchmarks if r['type'] == 'memory'],
-                "io_benchmarks": [r for r in successful_benchmarks if r['type'] == 'io']
+                f"{t}_benchmarks": [results[i] for i in np.flatnonzero(mask)]
+                for t, mask in by_type.items()
             }
         }
         
-        # Log comprehensive analysis
-        self.monitor.log_event("performance_analysis", analysis)
-        
-        # Calculate and log aggregate metrics
-        if successful_benchmarks:
-            avg_cpu_efficiency = sum(r.get('efficiency', 0) for r in analysis['performance_summary']['cpu_benchmarks']) / max(1, len(analysis['performance_summary']['cpu_benchmarks']))
-            avg_memory_throughput = sum(r.get('throughput', 0) for r in analysis['performance_summary']['memory_benchmarks']) / max(1, len(analysis['performance_summary']['memory_benchmarks']))
-            avg_io_throughput = sum(r.get('throughput', 0) for r in analysis['performance_summary']['io_benchmarks']) / max(1, len(analysis['performance_summary']['io_benchmarks']))
+        # Calculate aggregate metrics
+        metrics = {}
+        if successful_count:
+            avg_cpu_efficiency, avg_memory_throughput, avg_io_throughput = (
+                float(score[mask].mean()) if mask.any() else 0.0
+                for mask in by_type.values()
+            )
             
-            self.monitor.log_metric("avg_cpu_efficiency", avg_cpu_efficiency, "ops/sec")
-            self.monitor.log_metric("avg_memory_throughput", avg_memory_throughput, "MB/sec")
-            self.monitor.log_metric("avg_io_throughput", avg_io_throughput, "bytes/sec")
-            self.monitor.log_metric("benchmark_success_rate", analysis['success_rate'], "percentage")
+            metrics = {
+                "avg_cpu_efficiency": (avg_cpu_efficiency, "ops/sec"),
+                "avg_memory_throughput": (avg_memory_throughput, "MB/sec"),
+                "avg_io_throughput": (avg_io_throughput, "bytes/sec"),
+                "benchmark_success_rate": (analysis['success_rate'], "percentage")
+            }
+        
+        # Log comprehensive analysis alongside the aggregates
+        self.monitor.log_batch(events=[("performance_analysis", analysis)], metrics=metrics)
         
         # Print summary
         print(f"Total Benchmarks: {analysis['total_benchmarks']}")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test the LangChain example's calculator tool
+
+The tool evaluates user input, so only plain arithmetic may get through.
+"""
+
+import sys
+from unittest import mock
+
+import pytest
+
+import langchain_example
+from langchain_example import calculator_tool
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    """The mock tools simulate latency; skip it"""
+    with mock.patch.object(langchain_example.time, "sleep"):
+        yield
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("25 * 4 + 10", "Result: 110"),
+    ("-3 + +2", "Result: -1"),
+    ("7 / 2", "Result: 3.5"),
+    ("2 ** 10", "Result: 1024"),
+    ("(1.5 - 0.5) * 4", "Result: 4.0"),
+])
+def test_arithmetic(expression, expected):
+    """Test that plain arithmetic is evaluated"""
+    assert calculator_tool(expression) == expected
+
+
+@pytest.mark.parametrize("expression", [
+    "x + 1",                       # Name
+    "abs(-1)",                     # Call
+    "(1).real",                    # Attribute
+    "__import__('os').system('true')",
+    "'a' * 3",                     # Non-numeric literal
+    "True + 1",                    # bool literal
+    "[1, 2][0]",                   # Subscript and list
+    "9 ** 9 ** 9 ** 9",            # Non-literal exponent
+    "2 ** 101",                    # Exponent above the bound
+    "1 / 0",
+    pytest.param("-" * 5000 + "1", id="deep-unary"),
+    pytest.param("(" * 5000 + "1" + ")" * 5000, id="deep-parens"),
+])
+def test_rejected(expression):
+    """Test that anything other than bounded arithmetic is refused"""
+    assert calculator_tool(expression) == "Error: Invalid mathematical expression"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -2,305 +2,439 @@
 """
 Test Agent Monitor Package
 
-A simple test script to verify that the agent-monitor package is working correctly.
-Run this script to test basic functionality before using the package in your projects.
+A simple test suite to verify that the agent-monitor package is working correctly.
+Run it with pytest (or directly with python) before using the package in your projects.
+Dashboard traffic goes to the fake dashboard from the repository's conftest.py,
+so no network access or real credentials are needed.
 """
 
 import time
 import sys
-import traceback
+import threading
+
+import pytest
+
+import agent_monitor
+import agent_monitor.monitor
+from agent_monitor import AgentMonitor
+
+DASHBOARD_URL = "https://test-dashboard.example.com"
+API_KEY = "test-api-key"
+
+
+@pytest.fixture(scope="module")
+def monitor(dashboard):
+    """A monitor shared by the tests in this module"""
+    monitor = AgentMonitor(
+        dashboard_url=DASHBOARD_URL,
+        api_key=API_KEY,
+        agent_name="Test Agent",
+        heartbeat_interval=0,
+        auto_detect=False,
+        metadata={"test": True, "version": "1.0.0"}
+    )
+    yield monitor
+    monitor.stop()
+
 
 def test_basic_import():
     """Test if the package can be imported successfully"""
-    print("Testing package import...")
-    try:
-        import agent_monitor
-        from agent_monitor import AgentMonitor
-        print("  ✅ Package imported successfully")
-        return True
-    except ImportError as e:
-        print(f"  ❌ Import failed: {e}")
-        return False
-
-def test_initialization():
+    assert agent_monitor.AgentMonitor is AgentMonitor
+    assert callable(agent_monitor.init)
+
+
+def test_initialization(dashboard):
     """Test agent monitor initialization"""
-    print("\nTesting initialization...")
+    # Test with mock credentials
+    agent_monitor.init(
+        api_key=API_KEY,
+        dashboard_url=DASHBOARD_URL,
+        enable_logging=True
+    )
+
+    global_monitor = agent_monitor.get_global_monitor()
     try:
-        import agent_monitor
-        
-        # Test with mock credentials
-        agent_monitor.init(
-            api_key="test-api-key",
-            dashboard_url="https://test-dashboard.example.com",
-            enable_logging=True
-        )
-        print("  ✅ Initialization completed")
-        return True
-    except Exception as e:
-        print(f"  ❌ Initialization failed: {e}")
-        return False
-
-def test_agent_monitor_creation():
-    """Test creating an AgentMonitor instance"""
-    print("\nTesting AgentMonitor creation...")
+        assert global_monitor is not None
+        assert global_monitor.is_started
+    finally:
+        if global_monitor:
+            global_monitor.stop()
+        agent_monitor.set_global_monitor(None)
+
+
+def test_init_keeps_disabled_state(dashboard):
+    """Test that init() without enabled doesn't undo set_enabled(False)"""
+    agent_monitor.set_enabled(False)
     try:
-        from agent_monitor import AgentMonitor
-        
-        monitor = AgentMonitor(
-            agent_id="test-agent",
-            agent_name="Test Agent",
-            agent_type="test",
-            metadata={"test": True, "version": "1.0.0"}
-        )
-        print("  ✅ AgentMonitor instance created successfully")
-        return True, monitor
-    except Exception as e:
-        print(f"  ❌ AgentMonitor creation failed: {e}")
-        return False, None
-
-def test_session_management(monitor):
+        agent_monitor.init(api_key=API_KEY, dashboard_url=DASHBOARD_URL)
+        assert not agent_monitor.monitor._enabled
+
+        agent_monitor.init(api_key=API_KEY, dashboard_url=DASHBOARD_URL, enabled=True)
+        assert agent_monitor.monitor._enabled
+    finally:
+        agent_monitor.set_enabled(True)
+        global_monitor = agent_monitor.get_global_monitor()
+        if global_monitor:
+            global_monitor.stop()
+        agent_monitor.set_global_monitor(None)
+
+
+def test_agent_monitor_creation(monitor):
+    """Test creating an AgentMonitor instance"""
+    assert monitor.agent_name == "Test Agent"
+    assert monitor.metadata == {"test": True, "version": "1.0.0"}
+
+
+def test_session_management(monitor, dashboard):
     """Test session start and end functionality"""
-    print("\nTesting session management...")
-    try:
-        if not monitor:
-            print("  ⏭️ Skipped (no monitor instance)")
-            return False
-            
-        monitor.start_session()
-        print("  ✅ Session started")
-        
-        time.sleep(1)  # Brief pause
-        
-        monitor.end_session()
-        print("  ✅ Session ended")
-        return True
-    except Exception as e:
-        print(f"  ❌ Session management failed: {e}")
-        return False
-
-def test_event_logging(monitor):
+    agent_id = monitor.start_session()
+    assert agent_id
+    assert monitor.session_id
+
+    monitor.end_session()
+    assert monitor.session_id is None
+
+    events = dashboard.messages("event")
+    assert events[-2:] == ["session_start", "session_end"]
+
+
+def test_event_logging(monitor, dashboard):
     """Test event logging functionality"""
-    print("\nTesting event logging...")
-    try:
-        if not monitor:
-            print("  ⏭️ Skipped (no monitor instance)")
-            return False
-            
-        monitor.start_session()
-        
-        # Test various event types
-        test_events = [
-            ("initialization", {"test": True, "timestamp": time.time()}),
-            ("decision", {"action": "test_action", "confidence": 0.95}),
-            ("completion", {"status": "success", "duration": 1.23}),
-            ("error", {"error_type": "TestError", "message": "This is a test error"})
-        ]
-        
-        for event_type, data in test_events:
-            monitor.log_event(event_type, data)
-            print(f"    ✅ Logged {event_type} event")
-            time.sleep(0.2)
-            
-        monitor.end_session()
-        print("  ✅ All events logged successfully")
-        return True
-    except Exception as e:
-        print(f"  ❌ Event logging failed: {e}")
-        return False
-
-def test_metric_logging(monitor):
+    monitor.start_session()
+
+    # Test various event types
+    test_events = [
+        ("initialization", {"test": True, "timestamp": time.time()}),
+        ("decision", {"action": "test_action", "confidence": 0.95}),
+        ("completion", {"status": "success", "duration": 1.23}),
+        ("error", {"error_type": "TestError", "message": "This is a test error"})
+    ]
+
+    for event_type, data in test_events:
+        monitor.log_event(event_type, data)
+
+    assert monitor.flush(timeout=2.0)
+    monitor.end_session()
+
+    events = dashboard.messages("event")
+    assert events[-6:] == ["session_start", *(event_type for event_type, _ in test_events), "session_end"]
+
+
+def test_metric_logging(monitor, dashboard):
     """Test metric logging functionality"""
-    print("\nTesting metric logging...")
-    try:
-        if not monitor:
-            print("  ⏭️ Skipped (no monitor instance)")
-            return False
-            
-        monitor.start_session()
-        
-        # Test various metric types
-        test_metrics = [
-            ("response_time", 1.234, "seconds"),
-            ("accuracy", 0.95, "percentage"),
-            ("memory_usage", 128.5, "MB"),
-            ("requests_per_second", 42.7, "req/sec")
-        ]
-        
-        for metric_name, value, unit in test_metrics:
-            monitor.log_metric(metric_name, value, unit)
-            print(f"    ✅ Logged {metric_name}: {value} {unit}")
-            time.sleep(0.2)
-            
-        monitor.end_session()
-        print("  ✅ All metrics logged successfully")
-        return True
-    except Exception as e:
-        print(f"  ❌ Metric logging failed: {e}")
-        return False
-
-def test_status_updates(monitor):
+    monitor.start_session()
+
+    # Test various metric types
+    test_metrics = [
+        ("response_time", 1.234, "seconds"),
+        ("accuracy", 0.95, "percentage"),
+        ("memory_usage", 128.5, "MB"),
+        ("requests_per_second", 42.7, "req/sec")
+    ]
+
+    for metric_name, value, unit in test_metrics:
+        monitor.log_metric(metric_name, value, unit)
+
+    assert monitor.flush(timeout=2.0)
+    monitor.end_session()
+
+    sent = {row['message']: row['metadata'] for row in dashboard.logs() if row['message_type'] == 'metric'}
+    for metric_name, value, unit in test_metrics:
+        assert sent[metric_name] == {"value": value, "unit": unit}
+
+
+def test_metric_samples(monitor, dashboard):
+    """Test that each metric sample is sent as its own row with its own timestamp"""
+    monitor.start_session()
+
+    monitor.log_metric_samples([
+        (1_700_000_000_000_000_000, {"sampled_cpu": (10.0, "percentage")}),
+        (1_700_000_001_000_000_000, {"sampled_cpu": (20.0, "percentage")}),
+    ])
+
+    assert monitor.flush(timeout=2.0)
+    monitor.end_session()
+
+    rows = [row for row in dashboard.logs() if row['message'] == "sampled_cpu"]
+    assert [row['metadata']['value'] for row in rows] == [10.0, 20.0]
+    assert [row['timestamp'][:19] for row in rows] == ["2023-11-14T22:13:20", "2023-11-14T22:13:21"]
+
+
+def test_status_updates(monitor, dashboard):
     """Test status update functionality"""
-    print("\nTesting status updates...")
-    try:
-        if not monitor:
-            print("  ⏭️ Skipped (no monitor instance)")
-            return False
-            
-        monitor.start_session()
-        
-        # Test different status updates
-        statuses = ["idle", "running", "paused", "running", "completed"]
-        
-        for status in statuses:
-            monitor.update_status(status)
-            print(f"    ✅ Status updated to: {status}")
-            time.sleep(0.3)
-            
-        monitor.end_session()
-        print("  ✅ All status updates completed")
-        return True
-    except Exception as e:
-        print(f"  ❌ Status updates failed: {e}")
-        return False
-
-def test_error_handling():
+    monitor.start_session()
+
+    # Test different status updates
+    statuses = ["idle", "running", "paused", "running", "completed"]
+
+    for status in statuses:
+        monitor.update_status(status)
+
+    assert monitor.flush(timeout=2.0)
+    monitor.end_session()
+
+    # Updates queued together are coalesced, so only the latest is guaranteed
+    assert dashboard.statuses()[-1] == "completed"
+
+
+def test_error_handling(dashboard):
     """Test error handling and edge cases"""
-    print("\nTesting error handling...")
+    # Test with minimal parameters
+    monitor = AgentMonitor(
+        dashboard_url=DASHBOARD_URL,
+        api_key=API_KEY,
+        agent_name="Error Test Agent",
+        heartbeat_interval=0
+    )
+
+    monitor.start_session()
+
+    # Test with various edge cases
+    monitor.log_event("test", {})  # Empty data
+    monitor.log_event("test", {"complex": {"nested": {"data": [1, 2, 3]}}})  # Complex data
+    monitor.log_metric("test_metric", 0.0)  # Zero value
+    monitor.update_status("custom_status")  # Custom status
+
+    monitor.end_session()
+    client = monitor.client
+    monitor.stop()
+
+    assert client.send_errors == 0
+
+
+def test_compression_fallback(dashboard):
+    """Test that a 415 for a zstd batch turns compression off and resends it plain"""
+    pytest.importorskip("zstandard")
+
+    monitor = AgentMonitor(
+        dashboard_url=DASHBOARD_URL,
+        api_key=API_KEY,
+        agent_name="Compression Test Agent",
+        heartbeat_interval=0,
+        auto_detect=False,
+        compress=True
+    )
+    monitor.start_session()
+    assert monitor.flush(timeout=2.0)
+
+    dashboard.reject_zstd = True
     try:
-        from agent_monitor import AgentMonitor
-        
-        # Test with minimal parameters
-        monitor = AgentMonitor(
-            agent_id="error-test-agent",
-            agent_name="Error Test Agent"
-        )
-        
-        monitor.start_session()
-        
-        # Test with various edge cases
-        monitor.log_event("test", {})  # Empty data
-        monitor.log_event("test", {"complex": {"nested": {"data": [1, 2, 3]}}})  # Complex data
-        monitor.log_metric("test_metric", 0.0)  # Zero value
-        monitor.update_status("custom_status")  # Custom status
-        
-        monitor.end_session()
-        print("  ✅ Error handling tests passed")
-        return True
-    except Exception as e:
-        print(f"  ❌ Error handling test failed: {e}")
-        return False
-
-def run_comprehensive_test():
-    """Run a comprehensive integration test"""
-    print("\nRunning comprehensive integration test...")
+        # Comfortably above the compression threshold
+        for i in range(20):
+            monitor.log_event("compressed_event", {"index": i, "padding": "x" * 64})
+        assert monitor.flush(timeout=2.0)
+    finally:
+        dashboard.reject_zstd = False
+
+    client = monitor.client
+    monitor.stop()
+
+    assert len(dashboard.rejected) == 1
+    assert client._compressor is None
+    assert client.send_errors == 0
+    assert dashboard.messages("event").count("compressed_event") == 20
+
+
+def _batching_monitor(name, **kwargs):
+    monitor = AgentMonitor(
+        dashboard_url=DASHBOARD_URL,
+        api_key=API_KEY,
+        agent_name=name,
+        heartbeat_interval=0,
+        auto_detect=False,
+        **kwargs
+    )
+    monitor.start_session()
+    assert monitor.flush(timeout=2.0)
+    return monitor
+
+
+def test_unencodable_entry(dashboard):
+    """Test that an entry that can't be encoded doesn't drop the rest of its batch"""
+    monitor = _batching_monitor("Encoding Test Agent")
+
+    monitor.log_event("encoding_good", {"index": 1})
+    monitor.log_event("encoding_set", {"tags": {"a"}})  # Sent stringified
+    monitor.log_event("encoding_wide_int", {"value": 2 ** 70})  # Dropped
+    monitor.log_event("encoding_good", {"index": 2})
+
+    assert monitor.flush(timeout=2.0)
+    client = monitor.client
+    monitor.stop()
+
+    rows = {row['message']: row['metadata'] for row in dashboard.logs()}
+    assert dashboard.messages("event").count("encoding_good") == 2
+    assert rows["encoding_set"] == {"tags": "{'a'}"}
+    assert "encoding_wide_int" not in rows
+    assert client.send_errors == 1
+
+
+def test_set_enabled(dashboard):
+    """Test that set_enabled(False) suppresses every logging path"""
+    monitor = _batching_monitor("Enabled Test Agent")
+    # log_event and log_metric are the closures bound to the batcher
+    assert "log_event" in vars(monitor) and "log_metric" in vars(monitor)
+
+    agent_monitor.set_enabled(False)
     try:
-        from agent_monitor import AgentMonitor
-        
-        monitor = AgentMonitor(
-            agent_id="comprehensive-test",
-            agent_name="Comprehensive Test Agent",
-            agent_type="testing",
-            metadata={"test_type": "comprehensive", "duration": 30}
-        )
-        
-        monitor.start_session()
-        print("  ✅ Test session started")
-        
-        # Simulate a realistic agent workflow
-        monitor.log_event("initialization", {"model": "test-model", "config": {"temperature": 0.7}})
-        monitor.update_status("running")
-        
-        for i in range(5):
-            # Simulate task processing
-            monitor.log_event("task_start", {"task_id": i, "task_type": "test_task"})
-            monitor.log_metric("task_progress", (i / 5) * 100, "percentage")
-            time.sleep(0.5)
-            
-            monitor.log_event("task_completion", {"task_id": i, "status": "success"})
-            monitor.log_metric("tasks_completed", i + 1, "count")
-            
-        monitor.update_status("completed")
-        monitor.log_event("workflow_completion", {"total_tasks": 5, "success_rate": 100})
-        
-        monitor.end_session()
-        print("  ✅ Comprehensive test completed successfully")
-        return True
-    except Exception as e:
-        print(f"  ❌ Comprehensive test failed: {e}")
-        print(f"  Error details: {traceback.format_exc()}")
-        return False
-
-def main():
-    """Run all tests"""
-    print("🧪 Agent Monitor Package Test Suite")
-    print("=====================================\n")
-    
-    # List of all tests
-    tests = [
-        ("Package Import", test_basic_import),
-        ("Initialization", test_initialization),
-    ]
-    
-    # Run basic tests first
-    results = []
-    for test_name, test_func in tests:
-        result = test_func()
-        results.append((test_name, result))
-        
-        if not result:
-            print(f"\n❌ Critical test '{test_name}' failed. Stopping test suite.")
-            break
-    else:
-        # Run tests that require a monitor instance
-        success, monitor = test_agent_monitor_creation()
-        results.append(("AgentMonitor Creation", success))
-        
-        if success:
-            monitor_tests = [
-                ("Session Management", lambda: test_session_management(monitor)),
-                ("Event Logging", lambda: test_event_logging(monitor)),
-                ("Metric Logging", lambda: test_metric_logging(monitor)),
-                ("Status Updates", lambda: test_status_updates(monitor)),
-                ("Error Handling", test_error_handling),
-                ("Comprehensive Integration", run_comprehensive_test)
-            ]
-            
-            for test_name, test_func in monitor_tests:
-                result = test_func()
-                results.append((test_name, result))
-    
-    # Print test summary
-    print("\n\n📈 Test Results Summary")
-    print("=======================\n")
-    
-    passed_tests = sum(1 for _, result in results if result)
-    total_tests = len(results)
-    
-    for test_name, result in results:
-        status = "✅ PASSED" if result else "❌ FAILED"
-        print(f"{status} {test_name}")
-    
-    print(f"\n📊 Results: {passed_tests}/{total_tests} tests passed")
-    
-    if passed_tests == total_tests:
-        print("🎉 All tests passed! The agent-monitor package is working correctly.")
-        print("\nYou can now use the package in your projects with confidence.")
-        print("\nNext steps:")
-        print("1. Replace 'test-api-key' and 'test-dashboard-url' with your actual credentials")
-        print("2. Check out the examples in the examples/ directory")
-        print("3. Integrate the package with your AI agents")
-        print("4. Monitor your agents on your dashboard")
-    else:
-        print(f"⚠️ {total_tests - passed_tests} tests failed. Please check the errors above.")
-        print("\nTroubleshooting:")
-        print("1. Make sure all dependencies are installed: pip install -e .")
-        print("2. Check your Python version (3.7+ required)")
-        print("3. Verify network connectivity if using real API endpoints")
-        
-        return 1  # Exit with error code
-        
-    return 0  # Success
+        monitor.log_event("disabled_event", {})
+        monitor.log_metric("disabled_metric", 1.0)
+        monitor.log("info", "disabled_log")
+        monitor.log_metrics_bulk({"disabled_metric": (2.0, "count")})
+        monitor.log_event_critical("disabled_event", lambda: {})
+    finally:
+        agent_monitor.set_enabled(True)
+
+    monitor.log_event("enabled_event", {})
+    monitor.log_metric("enabled_metric", 1.0)
+    assert monitor.flush(timeout=2.0)
+    monitor.stop()
+
+    messages = {row['message'] for row in dashboard.logs()}
+    assert not messages & {"disabled_event", "disabled_metric", "disabled_log"}
+    assert {"enabled_event", "enabled_metric"} <= messages
+
+
+def test_stop_restores_logging_methods(dashboard):
+    """Test that stop() removes the batcher-bound logging methods"""
+    monitor = _batching_monitor("Restore Test Agent")
+    monitor.stop()
+
+    assert "log_event" not in vars(monitor) and "log_metric" not in vars(monitor)
+    assert monitor.log_event.__func__ is AgentMonitor.log_event
+    assert monitor.log_metric.__func__ is AgentMonitor.log_metric
+
+
+def test_concurrent_logging(dashboard):
+    """Test that metrics logged from many threads all arrive"""
+    monitor = _batching_monitor("Concurrency Test Agent")
+
+    def worker(n):
+        for i in range(500):
+            monitor.log_metric(f"thread_{n}_metric", i, "count")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    del threads, thread  # Let the exited threads be collected
+
+    assert monitor.flush(timeout=5.0)
+    batcher = monitor.batcher
+
+    for n in range(8):
+        values = [row['metadata']['value'] for row in dashboard.logs()
+                  if row['message'] == f"thread_{n}_metric"]
+        assert values == list(range(500))
+
+    # The drained buffers of exited threads are forgotten
+    assert all(ref() is not None for ref, _ in batcher._buffers)
+    monitor.stop()
+
+
+def test_queue_drops_oldest(dashboard):
+    """Test that a full per-thread buffer keeps only its newest entries"""
+    monitor = _batching_monitor("Queue Test Agent", flush_interval=60, max_batch=1000, max_queue=5)
+
+    def worker():
+        for i in range(20):
+            monitor.log_metric("bounded_metric", i, "count")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert monitor.flush(timeout=2.0)
+    monitor.stop()
+
+    values = [row['metadata']['value'] for row in dashboard.logs() if row['message'] == "bounded_metric"]
+    assert values == [15, 16, 17, 18, 19]
+
+
+def test_flush_timeout(dashboard):
+    """Test that flush() reports False when sending outlasts its timeout"""
+    monitor = _batching_monitor("Flush Timeout Test Agent")
+    release = threading.Event()
+    send_logs = monitor.client.send_logs
+
+    def slow_send_logs(entries):
+        release.wait(5.0)
+        send_logs(entries)
+
+    monitor.client.send_logs = slow_send_logs
+    try:
+        monitor.log_event("slow_event", {})
+        assert not monitor.flush(timeout=0.1)
+    finally:
+        release.set()
+
+    assert monitor.flush(timeout=2.0)
+    monitor.stop()
+
+    assert "slow_event" in dashboard.messages("event")
+
+
+def test_stop_during_slow_send(dashboard):
+    """Test that stop() leaves a send still in progress to the batch thread"""
+    monitor = _batching_monitor("Slow Stop Test Agent")
+    batcher = monitor.batcher
+    started = threading.Event()
+    release = threading.Event()
+    send_logs = monitor.client.send_logs
+
+    def slow_send_logs(entries):
+        started.set()
+        release.wait(5.0)
+        send_logs(entries)
+
+    monitor.client.send_logs = slow_send_logs
+    monitor.client.timeout = 0.1  # How long stop() waits for the batch thread
+    try:
+        monitor.log_event("stop_first", {})
+        monitor.flush(timeout=0)
+        assert started.wait(2.0)
+        monitor.log_event("stop_second", {})
+
+        monitor.stop()
+        assert batcher.is_alive()
+        assert not monitor.is_started
+    finally:
+        release.set()
+
+    batcher.join(2.0)
+    assert not batcher.is_alive()
+    events = dashboard.messages("event")
+    assert "stop_first" in events and "stop_second" in events
+
+
+def test_comprehensive_integration(monitor, dashboard):
+    """Run a comprehensive integration test"""
+    monitor.start_session({"test_type": "comprehensive", "duration": 30})
+
+    # Simulate a realistic agent workflow
+    monitor.log_event("initialization", {"model": "test-model", "config": {"temperature": 0.7}})
+    monitor.update_status("running")
+
+    for i in range(5):
+        # Per-task events are verbose; their data is only built if that level is enabled
+        monitor.log_event_verbose("task_start", lambda: {"task_id": i, "task_type": "test_task"})
+        monitor.log_metric("task_progress", (i / 5) * 100, "percentage")
+
+        monitor.log_event_verbose("task_completion", lambda: {"task_id": i, "status": "success"})
+        monitor.log_metric("tasks_completed", i + 1, "count")
+
+    monitor.update_status("completed")
+    monitor.log_event("workflow_completion", {"total_tasks": 5, "success_rate": 100})
+
+    assert monitor.flush(timeout=2.0)
+    monitor.end_session()
+
+    events = dashboard.messages("event")
+    assert "workflow_completion" in events
+    assert "task_start" not in events  # Below the default level
+    assert dashboard.messages("metric").count("tasks_completed") == 5
+
 
 if __name__ == "__main__":
-    exit_code = main()
-    sys.exit(exit_code)
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -30,12 +30,14 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "requests>=2.25.0",
+        "orjson>=3.9",
         "psutil>=5.8.0",  # For performance monitoring examples
     ],
     extras_require={
         "dev": [
-            "pytest>=6.0",
+            "pytest>=7.0",
             "pytest-asyncio",
+            "pytest-xdist",
             "black",
             "flake8",
         ],
@@ -43,7 +45,8 @@ setup(
         "langgraph": ["langgraph>=0.1.0"],
         "openai": ["openai>=1.0.0"],
         "anthropic": ["anthropic>=0.8.0"],
-        "performance": ["psutil>=5.8.0"],
+        "performance": ["psutil>=5.8.0", "numpy>=1.20", "numba>=0.56"],
+        "compression": ["zstandard>=0.22"],
         "all": [
             "langchain>=0.1.0",
             "langchain-core>=0.1.0",
@@ -51,6 +54,9 @@ setup(
             "openai>=1.0.0",
             "anthropic>=0.8.0",
             "psutil>=5.8.0",
+            "numpy>=1.20",
+            "numba>=0.56",
+            "zstandard>=0.22",
         ],
     },
     entry_points={
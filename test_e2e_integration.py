@@ -11,7 +11,10 @@ import sys
 import traceback
 from datetime import datetime
 
+import pytest
+
 # Test the real integration
+@pytest.mark.network
 def test_real_integration():
     """
     Test the package with the real dashboard to verify end-to-end integration.
@@ -141,6 +144,7 @@ def test_real_integration():
         
         return False
 
+@pytest.mark.network
 def test_simple_init_api():
     """
     Test the simple init() API that users will primarily use.